@@ -1,20 +1,106 @@
 
+import heapq
 from collections import Counter
 from itertools import combinations
+from anagram_race import normalize_word
+from signature import ALPHABET, Signature, anagram_key, letter_unit
+from rack_cache import RackCache, rack_key
+from rack_matrix import FamilyMatrix, numpy_available
+from lookup_cache import cached_lookup
+from dawg import Dawg
+from game_config import DEFAULT_CONFIG, GameConfig, check_config
+from word_corpus import corpus_checksum
+from family_index import build_family_index
+
+ENGINES = ("auto", "lookup", "dawg")
+SUB_RACK_LIMIT = 7 # longest rack the "auto" engine answers by enumerating sub-racks
 
 class AnagramExplorer:
-    def __init__(self, all_words: list[str]):
-       self.__corpus = all_words
-       self.anagram_lookup = self.build_lookup_dict() # Only calculated once, when the explorer object is created
+    def __init__(self, all_words: list[str], cache_size: int = 1024, lookup_cache_dir: str = None, engine: str = "auto",
+                 config: GameConfig = DEFAULT_CONFIG, family_index=None, compact: bool = False):
+       if engine not in ENGINES:
+          raise ValueError(f"engine must be one of {ENGINES}, got {engine!r}")
+       self.config = check_config(config) # rack size and minimum word length of the game variant
+       self.engine = engine # how get_all_anagrams finds a rack's families, see get_all_anagrams
+       self.__rack_cache = RackCache(cache_size) # results of get_all_anagrams/get_most_anagrams, keyed by sorted rack
+       self.__lookup_cache_dir = lookup_cache_dir # if set, anagram_lookup is loaded from/saved to this directory
+       #a family_index.FamilyIndex for all_words (a lowercase WordCorpus) stands in for every per-process index,
+       #so worker processes mapping the same corpus and index files share one copy
+       self.__family_index = family_index
+       #if set, the families are packed into an in-memory FamilyIndex instead of a dict of lists;
+       #the packed layout only holds words of lowercase a-z letters (every anagram_key a Signature)
+       self.__compact = compact
+       self.corpus = all_words
 
     @property
     def corpus(self):
       return self.__corpus
 
+    @corpus.setter
+    def corpus(self, all_words: list[str]):
+      #every index derived from the corpus is rebuilt here so they never drift apart; they are built into
+      #locals and only assigned once every check has passed, so a rejected corpus leaves the explorer as it was
+      family_index = self.__family_index
+      if self.__compact:
+         lookup = self.__load_lookup(all_words)
+         unpackable = next((anagrams[0] for key, anagrams in lookup.items() if not isinstance(key, Signature)), None)
+         if unpackable is not None:
+            raise ValueError(f"compact explorers only hold lowercase a-z words, got {unpackable!r}; use compact=False for this corpus")
+         family_index = build_family_index(lookup, all_words)
+      if family_index is not None:
+         if family_index.checksum != corpus_checksum(all_words):
+            raise ValueError("family_index was built from a different corpus")
+         word_index = family_index.corpus # binary search over the packed corpus
+         anagram_lookup = family_index
+         family_rank = family_index.rank
+         playable = family_index.playable(self.config.min_length)
+         multi = family_index.playable(0)
+      else:
+         word_index = frozenset(word.lower() for word in all_words) # case-normalized membership index
+         anagram_lookup = self.__load_lookup(all_words) # Only calculated once, when the explorer object is created
+         family_rank = {key: rank for rank, key in enumerate(anagram_lookup)}.__getitem__
+         #the families get_all_anagrams can return for this config: anagram pairs of at least min_length letters
+         playable = {key: anagrams for key, anagrams in anagram_lookup.items()
+                     if isinstance(key, Signature) and len(anagrams) > 1 and len(anagrams[0]) >= self.config.min_length}
+         multi = {key: anagrams for key, anagrams in anagram_lookup.items() if isinstance(key, Signature) and len(anagrams) > 1}
+      self.__corpus = all_words
+      self.__family_index = family_index
+      self.__word_index = word_index
+      self.anagram_lookup = anagram_lookup
+      self.__family_rank = family_rank
+      self.__playable = playable
+      self.__multi = multi
+      self.__family_matrix = None # built on the first batch query
+      self.__dawg = None
+      if self.engine == "dawg" or (self.engine == "auto" and self.config.rack_size > SUB_RACK_LIMIT):
+         self.dawg() # this config's racks are answered by the Dawg, so build it now rather than on the first query
+      self.__rack_cache.clear()
+
+    def __load_lookup(self, all_words: list[str]) -> dict:
+      if self.__lookup_cache_dir is None:
+         return self.build_lookup_dict(all_words)
+      return cached_lookup("explorer", all_words, lambda: self.build_lookup_dict(all_words), self.__lookup_cache_dir)
+
+    def cache_info(self):
+      '''Returns the rack cache's hits, misses, evictions, maxsize and current size.'''
+      return self.__rack_cache.info()
+
+    def is_word(self, word: str) -> bool:
+        '''Case-insensitive O(1) check that a word is in the corpus
+           (a binary search over the packed corpus when the explorer uses a FamilyIndex).
+
+            Args:
+                word (str): The word to look up
+
+            Returns:
+                bool: True if the lowercase form of word is in the corpus
+        '''
+        return word.lower() in self.__word_index
+
     def is_valid_anagram_pair(self, pair:tuple[str], letters:list[str]) -> bool:
         '''Checks whether a pair of words:
             -are both included in the allowable word list (self.corpus)
-            -are both at least 3 letters long (and the same)
+            -are both at least config.min_length (3 by default) letters long (and the same)
             -form a valid anagram pair
             -consist entirely of letters chosen at the beginning of the game
 
@@ -25,22 +111,22 @@ class AnagramExplorer:
             Returns:
                 bool: Returns True if the word pair fulfills all validation requirements, otherwise returns False
         '''
-        word1 = pair[0]
-        word2 = pair[1]
+        word1 = normalize_word(pair[0])
+        word2 = normalize_word(pair[1])
 
-        if word1.lower() not in self.corpus or word2.lower() not in self.corpus:
+        if len(word1) != len(pair[0]) or len(word2) != len(pair[1]): # contained characters other than letters
           return False
-        if len(word1) < 3:
+        if not self.is_word(word1) or not self.is_word(word2):
+          return False
+        if len(word1) < self.config.min_length:
            return False
         if len(word1) != len(word2):
            return False
-        if word1.lower() == word2.lower():
-           return False
-        if sorted(word1.lower()) != sorted(word2.lower()):
+        if word1 == word2:
            return False
-        if word1.lower() not in map(str.lower, self.corpus) or word2.lower() not in map(str.lower, self.corpus):
+        if sorted(word1) != sorted(word2):
            return False
-        for letter in word1.lower():
+        for letter in word1:
            if letter not in letters:
               return False
            
@@ -54,60 +140,123 @@ class AnagramExplorer:
         return True
 
         
-    def build_lookup_dict(self) -> dict:
-        '''Creates a fast dictionary look-up (via either prime hash or sorted tuple) of all anagrams in a word corpus.
+    def build_lookup_dict(self, corpus: list[str] = None) -> dict:
+        '''Creates a fast dictionary look-up (via letter-count Signature) of all anagrams in a word corpus.
        
             Args:
-                corpus (list): A list of words which should be considered
+                corpus (list): A list of words which should be considered, self.corpus by default
 
             Returns:
-                dict: Returns a dictionary with  keys that return sorted lists of all anagrams of the key (per the corpus)
+                dict: Returns a dictionary with Signature keys that return sorted lists of all anagrams of the key (per the corpus).
+                      Words a Signature can't hold (see signature.anagram_key) are keyed by their sorted letter tuple.
         '''
         lookup_dict = {}
-        for word in self.corpus:
-           #creates tuple of sorted letters as the key
-           sorted_word = tuple(sorted(word))
-           if sorted_word not in lookup_dict:
-              lookup_dict[sorted_word] = [word] 
+        for word in self.corpus if corpus is None else corpus:
+           #the packed letter counts of the word are the key
+           key = anagram_key(word)
+           if key not in lookup_dict:
+              lookup_dict[key] = [word]
            else:
-              lookup_dict[sorted_word].append(word)
-              for key in lookup_dict:
-                 lookup_dict[key] = sorted(lookup_dict[key])
+              lookup_dict[key].append(word)
+        #each family is sorted once, after the whole corpus has been grouped
+        for anagrams in lookup_dict.values():
+           if len(anagrams) > 1:
+              anagrams.sort()
         return lookup_dict
 
 
+    @staticmethod
+    def sub_racks(letters: list[str]) -> list[Signature]:
+        '''Enumerates the Signature of every sub-multiset of a rack, the same shape as the anagram_lookup keys.
+           A 7-letter rack has at most 128 sub-multisets, so rack queries are bounded by rack size instead of corpus size.
+           Letters outside a-z can't be part of any Signature key and are ignored.
+
+            Args:
+              letters (list): A list of letters from which the anagrams should be created
+
+            Returns:
+              list: one Signature for each distinct sub-multiset of letters (including the empty one)
+        '''
+        sub_racks = [0]
+        for letter, count in Counter(letters).items():
+           if letter not in ALPHABET or len(letter) != 1:
+              continue
+           unit = letter_unit(letter)
+           sub_racks = [sub_rack + unit * n for sub_rack in sub_racks for n in range(count + 1)]
+        return [Signature(sub_rack) for sub_rack in sub_racks]
+
+
     def get_all_anagrams(self, letters: list[str]) -> set:
          '''
          Creates a set of all unique words that could have been used to form an anagram pair.
          Words which can't create any anagram pairs should not be included in the set.
 
+            Words shorter than config.min_length (3 by default) are left out.
+
             Ex)
             corpus: ["abed", "mouse", "bead", "baled", "abled", "rat", "blade"]
             all_anagrams: {"abed",  "abled", "baled", "bead", "blade"}
 
+            The "lookup" engine checks the anagram_lookup for every sub-rack, which is 2^n lookups for an
+            n-letter rack. The "dawg" engine walks a Dawg of the anagram-pair words, spending rack letters as
+            it goes, so its cost follows the words reachable from the rack instead. "auto" (the default)
+            uses the lookup for racks up to SUB_RACK_LIMIT letters and the Dawg for larger ones.
+
             Args:
               letters (list): A list of letters from which the anagrams should be createdin 
 
             Returns:
-              set: all unique words in corpus which form at least 1 anagram pair
+              frozenset: all unique words in corpus which form at least 1 anagram pair.
+                         The result is shared with the rack cache, so it is immutable.
          '''
-         result = set()
-         for key in self.anagram_lookup:
-          is_valid = True
-          letters_list = letters.copy()
-          for letter in key:
-             if letter not in letters_list:
-                is_valid = False
-             else:
-                letters_list.remove(letter)
-          anagrams = self.anagram_lookup[key]
-          if len(anagrams) > 1 and is_valid and len(anagrams[0]) > 2:
-             for anagram in anagrams:
-               result.add(anagram)
+         cache_key = ("all", rack_key(letters))
+         result = self.__rack_cache.get(cache_key)
+         if result is not None:
+            return result
 
+         if self.engine == "dawg" or (self.engine == "auto" and len(letters) > SUB_RACK_LIMIT):
+            result = frozenset(self.dawg().formable(letters))
+         else:
+            result = set()
+            playable = self.__playable
+            for key in self.sub_racks(letters):
+             anagrams = playable.get(key)
+             if anagrams:
+                result.update(anagrams)
+            result = frozenset(result)
+         self.__rack_cache.put(cache_key, result)
          return result
         
 
+    def get_all_anagrams_batch(self, racks: list[list[str]]) -> list[frozenset]:
+         '''Runs get_all_anagrams for many racks at once.
+            With NumPy installed, every rack is checked against every family in one vectorized pass;
+            otherwise each rack goes through get_all_anagrams.
+
+            Args:
+              racks (list): A list of racks, each a list of letters
+
+            Returns:
+              list: the get_all_anagrams result for each rack, in order
+         '''
+         if not numpy_available():
+            return [self.get_all_anagrams(letters) for letters in racks]
+         return self.__matrix().all_anagrams(racks)
+
+
+    def dawg(self) -> Dawg:
+        '''Returns a Dawg of every word that forms at least 1 anagram pair, the words get_all_anagrams can return.'''
+        if self.__dawg is None:
+           self.__dawg = Dawg(word for anagrams in self.__playable.values() for word in anagrams)
+        return self.__dawg
+
+
+    def __matrix(self) -> FamilyMatrix:
+        if self.__family_matrix is None:
+           self.__family_matrix = FamilyMatrix(self.anagram_lookup, self.config.min_length)
+        return self.__family_matrix
+
+
     def get_most_anagrams(self, letters:list[str]) -> str:
         '''Returns any word from one of the largest lists of anagrams that 
            can be formed using the given letters.
@@ -118,21 +267,103 @@ class AnagramExplorer:
             Returns:
               str: a single word from the largest anagram families
         '''
+        cache_key = ("most", rack_key(letters))
+        max_anagram = self.__rack_cache.get(cache_key)
+        if max_anagram is not None:
+           return max_anagram
+
         max_anagram = ""
         max_length = 0
-        for anagrams in self.anagram_lookup.values():
-         is_valid = True
-         letters_list = letters.copy()
-         if len(anagrams) > max_length:
-            for letter in anagrams[0]:
-               if letter not in letters_list:
-                is_valid = False
-               else:
-                  letters_list.remove(letter)
-            if is_valid:
-               max_length = len(anagrams)
-               max_anagram = anagrams[0]
+        max_rank = len(self.anagram_lookup)
+        sub_racks = self.sub_racks(letters)
+        #any family of 2+ words beats every single word, so single-word families are only looked up when none fits
+        for families in (self.__multi, self.anagram_lookup):
+         for key in sub_racks:
+          anagrams = families.get(key)
+          if anagrams is None:
+             continue
+          #ties go to the family that comes first in the lookup dictionary
+          rank = self.__family_rank(key)
+          if len(anagrams) > max_length or (len(anagrams) == max_length and rank < max_rank):
+             max_length = len(anagrams)
+             max_rank = rank
+             max_anagram = anagrams[0]
+         if max_length:
+            break
+        self.__rack_cache.put(cache_key, max_anagram)
         return max_anagram
+
+
+    def get_most_anagrams_batch(self, racks: list[list[str]]) -> list[str]:
+        '''Runs get_most_anagrams for many racks at once (vectorized when NumPy is installed).
+
+            Args:
+              racks (list): A list of racks, each a list of letters
+
+            Returns:
+              list: the get_most_anagrams result for each rack, in order
+        '''
+        if not numpy_available():
+           return [self.get_most_anagrams(letters) for letters in racks]
+        return self.__matrix().most_anagrams(racks)
+
+
+    def get_top_families(self, letters: list[str] = None, k: int = 20) -> list[tuple[str]]:
+        '''Returns the k largest anagram families that can be formed using the given letters,
+           or in the whole corpus when letters is None.
+
+            Families are ranked by number of words, largest first; ties go to the family that comes
+            first in the lookup dictionary, as in get_most_anagrams, so the first family starts with
+            the get_most_anagrams word whenever any family of 2+ words fits. Only families of 2+ words
+            are ranked. A heap keeps the best k while the candidate families are scanned, which is
+            O(F log k) for F candidates: the families matching a sub-rack, or every family for the corpus.
+
+            Args:
+              letters (list): A list of letters from which the anagrams should be created, or None
+              k (int): How many families to return
+
+            Returns:
+              list: up to k families, each a tuple of its words in lookup order
+
+            Example
+            -------
+            >>> AnagramExplorer(["rat", "tar", "art", "stop", "pots", "tops", "opts"]).get_top_families(list("potsria"), 2)
+            [('opts', 'pots', 'stop', 'tops'), ('art', 'rat', 'tar')]
+        '''
+        if k < 0:
+           raise ValueError(f"k must be at least 0, got {k}")
+        cache_key = ("top", None if letters is None else rack_key(letters), k)
+        result = self.__rack_cache.get(cache_key)
+        if result is not None:
+           return list(result)
+
+        if letters is None:
+           candidates = ((anagrams, rank) for rank, anagrams in enumerate(self.anagram_lookup.values()) if len(anagrams) > 1)
+        else:
+           multi, family_rank = self.__multi, self.__family_rank
+           candidates = ((anagrams, family_rank(key)) for key in self.sub_racks(letters)
+                         if (anagrams := multi.get(key)) is not None)
+        best = heapq.nsmallest(k, candidates, key=lambda family: (-len(family[0]), family[1]))
+        result = tuple(tuple(anagrams) for anagrams, _ in best)
+        self.__rack_cache.put(cache_key, result)
+        return list(result)
+
+
+    def get_top_families_batch(self, racks: list[list[str]], k: int = 20) -> list[list[tuple[str]]]:
+        '''Runs get_top_families for many racks at once (vectorized when NumPy is installed).
+
+            Args:
+              racks (list): A list of racks, each a list of letters
+              k (int): How many families to return per rack
+
+            Returns:
+              list: the get_top_families result for each rack, in order
+        '''
+        if k < 0:
+           raise ValueError(f"k must be at least 0, got {k}")
+        if not numpy_available():
+           return [self.get_top_families(letters, k) for letters in racks]
+        return self.__matrix().top_families(racks, k)
     
 
 if __name__ == "__main__":
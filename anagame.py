@@ -1,11 +1,28 @@
+from __future__ import annotations
+import importlib
+import sys
 import time
-import random
-from valid_anagame_words import get_valid_word_list
-from AnagramExplorer import AnagramExplorer
+from timed_input import DeadlineReader
+from guess_scorer import GuessScorer
+from hint_engine import HintEngine
+
+#the explorer (and numpy behind it), the corpus and the rack table are only imported when first used,
+#so tools that just need parse_guess or display_stats start quickly. `anagame.AnagramExplorer` and
+#`from anagame import get_valid_word_list` still work.
+_LAZY_IMPORTS = {"AnagramExplorer": "AnagramExplorer", "get_word_corpus": "word_corpus", "get_rack_table": "rack_table",
+                 "get_valid_word_list": "valid_anagame_words"}
+
+def __getattr__(name: str):
+   if name in _LAZY_IMPORTS:
+      value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+      globals()[name] = value
+      return value
+   raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def generate_letters(fun_factor: int, distribution: str, explorer:AnagramExplorer) -> list:
-   '''Generates a list of 7 randomly-chosen lowercase letters which can form at least 
-      fun_factor unique anagramable words
+   '''Generates a list of randomly-chosen lowercase letters (explorer.config.rack_size of them, 7 by default)
+      which can form at least fun_factor unique anagramable words
 
          Args:
           fun_factor (int): minimum number of unique anagram words offered by the chosen letters
@@ -15,64 +32,23 @@ def generate_letters(fun_factor: int, distribution: str, explorer:AnagramExplore
           explorer (AnagramExplorer): helper object used to facilitate computing anagrams based on specific letters.
          
          Returns:
-             set: A set of 7 lowercase letters
+             set: A set of rack_size lowercase letters
+
+         Raises:
+             ValueError: if no rack drawable from the distribution offers fun_factor words
 
          Example
          -------
-         >>> explorer = AnagramExplorer(get_valid_word_list())
+         >>> explorer = AnagramExplorer(get_word_corpus())
          >>> generate_letters(75, "scrabble", explorer)
          ["p", "o", "t", "s", "r", "i", "a"]
    '''
-   letters = ["p", "o", "t", "s", "r", "i", "a"] 
-
-   alphabet = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l', 'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x', 'y', 'z']
-
-   if distribution == "uniform":
-        while True:
-            letters.clear()
-            for i in range (7):
-                number = random.randint(0, 25)
-                letters.append(alphabet[number])
-            if len(explorer.get_all_anagrams(letters)) >= fun_factor:
-                break
-   else:
-        while True:
-            scrabble_distribution = ['a', 'a', 'a', 'a', 'a', 'a', 'a', 'a', 'a', 
-        'b', 'b', 
-        'c', 'c', 
-        'd', 'd', 'd', 'd', 
-        'e', 'e', 'e', 'e', 'e', 'e', 'e', 'e', 'e', 'e', 'e', 'e', 
-        'f', 'f', 
-        'g', 'g', 'g', 
-        'h', 'h', 
-        'i', 'i', 'i', 'i', 'i', 'i', 'i', 'i', 'i', 
-        'j', 
-        'k', 
-        'l', 'l', 'l', 'l', 
-        'm', 'm', 
-        'n', 'n', 'n', 'n', 'n', 'n', 
-        'o', 'o', 'o', 'o', 'o', 'o', 'o', 'o', 
-        'p', 'p', 
-        'q', 
-        'r', 'r', 'r', 'r', 'r', 'r', 
-        's', 's', 's', 's', 
-        't', 't', 't', 't', 't', 't', 
-        'u', 'u', 'u', 'u', 
-        'v', 'v', 
-        'w', 'w', 
-        'x', 
-        'y', 'y', 
-        'z']
-
-            letters.clear()
-            for i in range (7):
-                number = random.randint(0, len(scrabble_distribution)-1)
-                letters.append(scrabble_distribution[number])
-                scrabble_distribution.pop(number)
-            if len(explorer.get_all_anagrams(letters)) >= fun_factor:
-                break
-    
-   return letters
+   #racks are drawn from a precomputed table of every playable rack, so no rejection sampling is needed,
+   #except for variants whose racks are too large to tabulate
+   from rack_table import MAX_TABLE_RACK_SIZE, draw_playable_rack, get_rack_table
+   if explorer.config.rack_size > MAX_TABLE_RACK_SIZE:
+      return draw_playable_rack(explorer, fun_factor, distribution)
+   return get_rack_table(explorer).sample(fun_factor, distribution)
 
 
 def parse_guess(guess:str) -> tuple:
@@ -108,32 +84,77 @@ def parse_guess(guess:str) -> tuple:
         return guess[0], guess[1]
 
 
-def play_game(time_limit: int, letters: list, explorer:AnagramExplorer) -> list:
+def play_game(time_limit: int, letters: list, explorer:AnagramExplorer, stream=None, timestamps: list = None,
+              hints: HintEngine = None) -> list:
     '''Plays a single game of AnaGame
 
+       The round ends exactly when time_limit runs out, even while the player is still typing: input is
+       read with a DeadlineReader against a time.monotonic() deadline rather than checked after each input().
+
        Args:
          time_limit: Time limit in seconds
          letters: A list of valid letters from which the player can create an anagram
          explorer (AnagramExplorer): helper object used to compute anagrams of letters.
+         stream: Where guesses are read from, sys.stdin by default
+         timestamps (list): If given, the seconds since the start of the round at which each guess
+                            was entered are appended to it (see guess_latencies)
+         hints (HintEngine): Answers the 'hint' command; by default a "smallest" strategy engine for letters.
+                             Its given list records the hints served.
 
        Returns:
           A list of tuples reprsenting all player guesses
    '''
-    start_time = time.time()
+    start_time = time.monotonic()
+    deadline = start_time + time_limit
+    reader = DeadlineReader(sys.stdin if stream is None else stream)
+    hints = HintEngine(letters, explorer) if hints is None else hints
     guesses = []
 
-    while time.time() - start_time < time_limit:
-        guess = input("Enter your guess: ") 
-        if guess.lower() == 'quit':
-            break
-        if guess.lower() == 'hint': 
-            print(f"Hint: Try finding words using these letters: {letters}")
-            continue
-        parsed_guess = parse_guess(guess)
-        if parsed_guess == ("", ""): 
-            print("Invalid guess format. Please use the format 'word1,word2'.")
-            continue
-        guesses.append(parsed_guess)
+    try:
+        while True:
+            print("Enter your guess: ", end="", flush=True)
+            guess = reader.readline(deadline)
+            if guess is None:
+                if time.monotonic() >= deadline:
+                    print("\nTime's up!")
+                break
+            if guess.lower() == 'quit':
+                break
+            if guess.lower() == 'hint': 
+                hint = hints.next_hint()
+                if hint is None:
+                    print("Hint: You've found every anagram family on this rack!")
+                else:
+                    print(f"Hint: {hint.size} words use the letters {', '.join(hint.letters)}")
+                continue
+            parsed_guess = parse_guess(guess)
+            if parsed_guess == ("", ""): 
+                print("Invalid guess format. Please use the format 'word1,word2'.")
+                continue
+            guesses.append(parsed_guess)
+            hints.record_guess(parsed_guess)
+            if timestamps is not None:
+                timestamps.append(time.monotonic() - start_time)
+    finally:
+        reader.close()
+    return guesses
+
+
+def guess_latencies(timestamps: list) -> list:
+    '''Turns the timestamps recorded by play_game into the seconds the player took for each guess
+
+        Args:
+          timestamps (list): Seconds since the start of the round, one per guess, in order
+
+        Returns:
+          list: The time before the first guess, then between each guess and the next
+
+        Example
+        -------
+        >>> guess_latencies([2.5, 4.0, 9.0])
+        [2.5, 1.5, 5.0]
+    '''
+    return [later - earlier for earlier, later in zip([0.0] + timestamps, timestamps)]
 
 
 def calc_stats(guesses: list, letters: list, explorer) -> dict:
@@ -159,7 +180,7 @@ def calc_stats(guesses: list, letters: list, explorer) -> dict:
      -------
      >>> letters = ["p", "o", "t", "s", "r", "i", "a"]
      >>> guesses = [("star","tarts"),("far","rat"),("rat","art"),("rat","art"),("art","rat")]
-     >>> explorer = AnagramExplorer(get_valid_word_list())
+     >>> explorer = AnagramExplorer(get_word_corpus())
      >>> calc_stats(guesses, letters, explorer)
      {
         "valid":[("rat","art")],
@@ -171,45 +192,55 @@ def calc_stats(guesses: list, letters: list, explorer) -> dict:
         "skill": 2
      }
     '''
-    stats = {}
-    stats["valid"] = []   #list of tuples
-    stats["invalid"] = [] #list of tuples
-    stats["score"] = 0    #total score per the rules of the game
-    stats["accuracy"] = 0 #truncated int percentage representing valid player guesses out of all player guesses
-    stats["skill"] = 0    #truncated int percentage representing unique guessed words out of all possible unique anagram words
-    stats["guessed"] = set() #unique valid guessed words
-    stats["not guessed"] = set() #unique words the player could have guessed, but didn’t
-
-    all_possible_anagrams = set(explorer.get_all_anagrams(letters)) 
-    unique_valid_guesses = set()
-
+    scorer = GuessScorer(letters, explorer)
     for guess in guesses:
-        word1, word2 = guess
-        if word1 in all_possible_anagrams and word2 in all_possible_anagrams and word1 != word2:
-            if guess not in stats["valid"]: 
-                stats["valid"].append(guess)
-                unique_valid_guesses.add(word1)
-                unique_valid_guesses.add(word2)
-                stats["score"] += 1
-            else:
-                stats["invalid"].append(guess)
-        else:
-            stats["invalid"].append(guess)
-
-    if guesses:
-        stats["accuracy"] = int((len(stats["valid"]) / len(guesses)) * 100) 
-    else:
-        0
-    stats["guessed"] = unique_valid_guesses
-    stats["not guessed"] = all_possible_anagrams - unique_valid_guesses
-    if all_possible_anagrams:
-        stats["skill"] = int((len(unique_valid_guesses) / len(all_possible_anagrams)) * 100) 
-    else:
-        0
+        scorer.add(guess)
+    return scorer.snapshot()
 
 
+def validate_guesses(guesses: list, letters: list, explorer, all_possible_anagrams: set = None) -> dict:
+    '''Classifies a whole list of guesses for one rack in a single pass.
+       Guesses go through a GuessScorer, so the rack's anagrams are computed once
+       (or passed in by validate_games, which shares them across games with the same rack).
+
+     Args:
+      guesses (list): A list of tuples representing all word pairs guesses by the user
+      letters (list): The list of valid letters from which user should create anagrams
+      explorer (AnagramExplorer): helper object used to compute anagrams of letters.
+      all_possible_anagrams (set): explorer.get_all_anagrams(letters), if the caller already has it
+
+     Returns:
+      dict: The calc_stats keys, except that "invalid" holds only guesses that were never valid, plus
+            "duplicate" - list of repeats of an earlier valid guess
+            "classification" - "valid", "invalid" or "duplicate" for each guess, in order
+    '''
+    scorer = GuessScorer(letters, explorer, all_possible_anagrams)
+    for guess in guesses:
+        scorer.add(guess)
+    stats = scorer.snapshot()
+    stats["invalid"] = list(scorer.invalid)
+    stats["duplicate"] = list(scorer.duplicate)
+    stats["classification"] = list(scorer.classification)
     return stats
 
+
+def validate_games(games: list, explorer) -> list:
+    '''Runs validate_guesses over many recorded games, eg. when replaying logs to rebuild leaderboards.
+       Each distinct rack is solved once, in a single batched explorer query.
+
+     Args:
+      games (list): (guesses, letters) tuples, one per game
+      explorer (AnagramExplorer): helper object used to compute anagrams of letters.
+
+     Returns:
+      list: The validate_guesses dictionary for each game, in order
+    '''
+    racks = {}
+    for _, letters in games:
+        racks.setdefault(tuple(sorted(letters)), letters)
+    solutions = dict(zip(racks, explorer.get_all_anagrams_batch(list(racks.values()))))
+    return [validate_guesses(guesses, letters, explorer, solutions[tuple(sorted(letters))]) for guesses, letters in games]
+
 def display_stats(stats):
     '''Prints a string representation of the game results
 
@@ -240,9 +271,13 @@ def display_stats(stats):
 
 
 if __name__ == "__main__":
+  from AnagramExplorer import AnagramExplorer
+  from lookup_cache import DEFAULT_DIR as DEFAULT_LOOKUP_CACHE_DIR
+  from word_corpus import get_word_corpus
+
   time_limit = 60
 
-  explorer = AnagramExplorer(get_valid_word_list()) #helper object
+  explorer = AnagramExplorer(get_word_corpus(), lookup_cache_dir=DEFAULT_LOOKUP_CACHE_DIR) #helper object
   letters = generate_letters(100, "scrabble", explorer)
 
   print("\nWelcome to Anagame!\n")
@@ -251,6 +286,10 @@ if __name__ == "__main__":
   print(f"You have {time_limit} seconds to guess as many anagrams as possible!")
   print(f"{letters}")
 
-  guesses = play_game(time_limit, letters, explorer)
+  timestamps = []
+  guesses = play_game(time_limit, letters, explorer, timestamps=timestamps)
   stats_dict = calc_stats(guesses, letters, explorer)
   display_stats(stats_dict)
+  if timestamps:
+    latencies = guess_latencies(timestamps)
+    print(f"Average time per guess: {sum(latencies) / len(latencies):.1f}s (slowest {max(latencies):.1f}s)")
@@ -1,5 +1,8 @@
+import os
 from itertools import combinations
 
+from signature import anagram_key
+
 def build_sorted_hash_dict(corpus: list) -> dict:
     '''Creates a fast dictionary look-up of words in a word corpus by anagrammability.
       
@@ -79,11 +82,177 @@ def build_prime_hash_dict(corpus):
     return prime_dictionary 
 
 
-def get_most_anagrams(corpus:list)->list:
+PRIME_MODULUS = (1 << 61) - 1 # Mersenne prime, so every reduced hash fits in 64 bits
+_PACKED_UNITS = {letter: 1 << (4 * i) for i, letter in enumerate(prime_map)}
+
+
+def prime_hash_mod(word: str, modulus: int = PRIME_MODULUS) -> int:
+  #prime hash reduced modulo a large prime; one modular power per distinct letter, so the cost doesn't grow with repeats
+  #different words can share a value, so equal hashes must be verified (see build_bounded_hash_dict)
+  return _prime_mod_of_counts({letter: word.count(letter) for letter in set(word)}, modulus)
+
+
+def _prime_mod_of_counts(counts: dict, modulus: int = PRIME_MODULUS) -> int:
+  hash_value = 1
+  for letter, count in counts.items():
+     hash_value = hash_value * pow(prime_map[letter], count, modulus) % modulus
+  return hash_value
+
+
+def packed_hash(word: str) -> int:
+  #letter counts packed 4 bits per letter (Signature's layout with half-byte fields, 104 bits); exact for words
+  #with at most 15 of each letter. More repeats fall back to the negated prime_hash_mod, which stays within
+  #64 bits but must be verified like prime_hash_mod (see hash_is_exact). Letters outside a-z raise KeyError.
+  if len(word) <= 15:
+     return sum(map(_PACKED_UNITS.__getitem__, word))
+  counts = {letter: word.count(letter) for letter in set(word)}
+  if max(counts.values()) > 15:
+     return -1 - _prime_mod_of_counts(counts)
+  return sum(_PACKED_UNITS[letter] * count for letter, count in counts.items())
+
+
+HASH_BACKENDS = {"prime": prime_hash, "prime_mod": prime_hash_mod, "packed": packed_hash}
+EXACT_BACKENDS = {"prime"} # equal hashes always mean anagrams
+
+
+def hash_is_exact(backend: str, value: int) -> bool:
+  #whether equal values of this backend always mean anagrams: "packed" ones are, except its negative prime_hash_mod fallback
+  return backend in EXACT_BACKENDS or (backend == "packed" and value >= 0)
+
+
+def build_bounded_hash_dict(corpus: list, backend: str = "packed") -> dict:
+    '''build_prime_hash_dict with a selectable hash function whose values stay within 64 or 128 bits.
+
+       Args:
+        corpus (list): A list of words which should be considered
+        backend (str): "packed" - 4-bit letter counts, exact up to 15 of a letter, verified above that (see packed_hash)
+                       "prime_mod" - prime product modulo a 61-bit prime; a hash shared by words that
+                                     aren't anagrams is detected and the later family gets the key (hash, n)
+                       "prime" - the unbounded prime product, as build_prime_hash_dict
+
+       Returns:
+        dict: Hash keys that return alphabetized lists of words from the corpus which are all anagrams of each other
+    '''
+
+    hash_function = HASH_BACKENDS[backend]
+    dictionary = {}
+    for word in corpus:
+        key = hash_function(word)
+        if key in dictionary and not hash_is_exact(backend, key):
+            #only words joining an existing key need checking; a mismatch probes (hash, 1), (hash, 2), ...
+            base, probe = key, 0
+            while key in dictionary and sorted(dictionary[key][0]) != sorted(word):
+                probe += 1
+                key = (base, probe)
+        if key not in dictionary:
+            dictionary[key] = [word]
+        else:
+            dictionary[key].append(word)
+    for words in dictionary.values():
+        words.sort()
+    return dictionary
+
+
+def build_signature_dict(corpus: list) -> dict:
+    '''Creates a fast dictionary look-up of words in a word corpus by letter-count Signature.
+       The same families as build_sorted_hash_dict, with compact integer keys instead of letter tuples.
+
+       Args:
+        corpus (list): A list of words which should be considered
+
+       Returns:
+        dict: Keys: signature.anagram_key of each word (a Signature for a-z words)
+              Values: alphabetized list of words from the corpus which are all anagrams of each other
+
+       Examples
+       ----------
+       >>> build_signature_dict(["abed", "abled", "bade", "baled", "bead", "blade"])
+       {
+           Signature('abde'): ["abed", "bade", "bead"],
+           Signature('abdel'): ["abled", "baled", "blade"]
+       }
+    '''
+
+    dictionary = {}
+    for word in corpus:
+        key = anagram_key(word)
+        if key not in dictionary:
+            dictionary[key] = [word]
+        else:
+            dictionary[key].append(word)
+    for words in dictionary.values():
+        words.sort()
+    return dictionary
+
+
+def merge_hash_dicts(shards: list) -> dict:
+    '''Merges lookup dictionaries built from consecutive slices of a corpus.
+       Keys keep the order of their first appearance, so the result matches a single-process build.
+
+       Args:
+        shards (list): Dictionaries from build_sorted_hash_dict or build_prime_hash_dict, in corpus order
+
+       Returns:
+        dict: The combined dictionary, with each value alphabetized
+    '''
+    merged = {}
+    split_keys = set()
+    for shard in shards:
+        for key, words in shard.items():
+            if key in merged:
+                merged[key].extend(words)
+                split_keys.add(key)
+            else:
+                merged[key] = words
+    for key in split_keys:
+        merged[key].sort()
+    return merged
+
+
+def build_hash_dict_parallel(corpus: list, build=build_sorted_hash_dict, workers: int = None, shards: int = None) -> dict:
+    '''Builds a lookup dictionary by sharding the corpus across a process pool, then merging the shards.
+
+       Args:
+        corpus (list): A list of words which should be considered
+        build (function): build_sorted_hash_dict or build_prime_hash_dict (any picklable corpus -> dict function)
+        workers (int): Number of worker processes (defaults to the CPU count)
+        shards (int): Number of contiguous corpus slices (defaults to 4 per worker)
+
+       Returns:
+        dict: The same dictionary build(corpus) returns
+    '''
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers * 4
+    if workers == 1 or len(corpus) < shards:
+        return build(corpus)
+    size = -(-len(corpus) // shards)
+    slices = [corpus[start:start + size] for start in range(0, len(corpus), size)]
+    from concurrent.futures import ProcessPoolExecutor  # only multi-process builds pay for importing it
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_hash_dicts(list(pool.map(build, slices)))
+
+
+def build_sorted_hash_dict_parallel(corpus: list, workers: int = None) -> dict:
+    '''Multi-process build_sorted_hash_dict, for corpora with millions of words.'''
+    return build_hash_dict_parallel(corpus, build_sorted_hash_dict, workers)
+
+
+def build_prime_hash_dict_parallel(corpus: list, workers: int = None) -> dict:
+    '''Multi-process build_prime_hash_dict, for corpora with millions of words.'''
+    return build_hash_dict_parallel(corpus, build_prime_hash_dict, workers)
+
+
+def build_signature_dict_parallel(corpus: list, workers: int = None) -> dict:
+    '''Multi-process build_signature_dict, for corpora with millions of words.'''
+    return build_hash_dict_parallel(corpus, build_signature_dict, workers)
+
+
+def get_most_anagrams(corpus:list, workers:int=1)->list:
     '''Uses a fast dictionary look-up to explore all anagram combinations in a word corpus.
   
        Args:
         corpus (list): A list of words which should be considered
+        workers (int): Processes used to build the look-up (see build_hash_dict_parallel)
 
        Returns:
         list: An alphabetized list of words
@@ -99,7 +268,7 @@ def get_most_anagrams(corpus:list)->list:
        
     '''
  
-    anagram_dict = build_sorted_hash_dict(corpus)
+    anagram_dict = build_signature_dict_parallel(corpus, workers)
     max = 1
     result = []
     for words in anagram_dict.values():
@@ -113,12 +282,13 @@ def get_most_anagrams(corpus:list)->list:
     return sorted(result)
 
 
-def get_all_anagrams(corpus:list[str])->set:
+def get_all_anagrams(corpus:list[str], workers:int=1)->set:
     '''Creates a set of all unique words in a word corpus that could have been used to form an anagram pair.
         Words which can't create any anagram pairs should not be included in the set.
 
         Args:
           corpus (list): A list of words which should be considered
+          workers (int): Processes used to build the look-up (see build_hash_dict_parallel)
 
         Returns:
           set: all unique words in wordlist which form at least 1 anagram pair
@@ -129,7 +299,7 @@ def get_all_anagrams(corpus:list[str])->set:
         {"abed",  "abled", "baled", "bead", "blade"}
     '''
 
-    anagram_dict = build_sorted_hash_dict(corpus)
+    anagram_dict = build_signature_dict_parallel(corpus, workers)
     result = set()
     for words in anagram_dict.values():
         if len(words) > 1:
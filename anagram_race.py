@@ -1,5 +1,32 @@
 import itertools
 
+from anagram_lookup import HASH_BACKENDS, hash_is_exact
+from signature import anagram_key
+
+LIMIT_ACTIONS = ("raise", "fallback") # what is_anagram_exhaustive does with words over max_length
+
+# bytes outside a-z, deleted in one bytes.translate pass after lowercasing
+_NON_LETTER_BYTES = bytes(b for b in range(128) if not 97 <= b <= 122)
+
+
+def normalize_word(word:str)->str:
+    '''Lowercases a word and strips every character other than a-z.
+       Non-ASCII characters are dropped by the ascii encode and the rest by a byte translation
+       table, so the whole word is handled in C without building intermediate strings per letter.
+
+       Args:
+         word: The word to normalize
+
+       Returns:
+         str: The lowercase a-z letters of word, in order
+
+       Examples:
+        >>> normalize_word("Baste2")
+        'baste'
+    '''
+    return word.lower().encode("ascii", "ignore").translate(None, _NON_LETTER_BYTES).decode("ascii")
+
+
 def basic_checks(word1:str, word2:str)-> tuple[bool, str, str]:
     '''Implements top-level checks common to each is_anagram approach. 
        Anagram basic checks include ensuring the two input words:
@@ -24,21 +51,8 @@ def basic_checks(word1:str, word2:str)-> tuple[bool, str, str]:
         False, baste, beasts
     '''
 
-    word1 = word1.lower()
-    word2 = word2.lower()
-
-    x = ""
-    y = ""
-
-    for i in range (0, len(word1)):
-        if ord(word1[i]) <= 122 and ord(word1[i]) >= 97:
-            x += word1[i]
-    word1 = x
-
-    for i in range (0, len(word2)):
-        if ord(word2[i]) <= 122 and ord(word2[i]) >= 97:
-            y += word2[i]
-    word2 = y
+    word1 = normalize_word(word1)
+    word2 = normalize_word(word2)
 
     if word1 == word2:
         return False, word1, word2
@@ -49,27 +63,67 @@ def basic_checks(word1:str, word2:str)-> tuple[bool, str, str]:
         return False, word1, word2
  
 
-def is_anagram_exhaustive(word1:str, word2:str)->bool:
+def is_anagram_exhaustive(word1:str, word2:str, prune:bool=True, max_length:int=None, on_limit:str="raise")->bool:
     '''Generate all possible permutations of the first word until you find one that is the second word.
        If no permutation of the first word equals the second word, the two are not anagrams.
 
+       Permutations are streamed and the search stops at the first match. With prune=True the search
+       walks distinct permutations letter by letter and abandons any prefix that differs from the
+       second word, so it never visits more than len(word) * 26 prefixes. With prune=False every
+       permutation is generated in turn (n! for a non-anagram), which is what max_length guards against.
+
        Args:
         word1: The first word
         word2: The second word
+        prune: Abandon permutation prefixes that can't become word2
+        max_length: Words longer than this are refused or handed to the fallback (no limit if None)
+        on_limit: "raise" to raise ValueError above max_length, "fallback" to use is_anagram_sort_hash
 
        Returns:
         bool: True if word1 and word2 are anagrams, False otherwise 
+
+       Raises:
+        ValueError: If on_limit isn't one of LIMIT_ACTIONS, or a word is over max_length with on_limit="raise"
     '''
     
+    if on_limit not in LIMIT_ACTIONS:
+        raise ValueError(f"on_limit must be one of {LIMIT_ACTIONS}, got {on_limit!r}")
     check, word1, word2 = basic_checks(word1, word2)
     if (check == False):
         return False
 
-    permutation_list = list(itertools.permutations(word1))
-    x = tuple(word2)
-    if x in permutation_list:
-        return True
-    else: return False
+    if max_length is not None and len(word1) > max_length:
+        if on_limit == "fallback":
+            return is_anagram_sort_hash(word1, word2)
+        raise ValueError(f"is_anagram_exhaustive refuses {len(word1)}-letter words (max_length={max_length})")
+
+    if not prune:
+        x = tuple(word2)
+        return any(permutation == x for permutation in itertools.permutations(word1))
+
+    # depth-first search over distinct permutations; each stack entry is the letters still to try at that depth
+    remaining = {}
+    for char in word1:
+        remaining[char] = remaining.get(char, 0) + 1
+    stack = [sorted(remaining)]
+    prefix = []
+    while stack:
+        candidates = stack[-1]
+        if not candidates:
+            stack.pop()
+            if prefix:
+                char = prefix.pop()
+                remaining[char] += 1
+            continue
+        char = candidates.pop()
+        if remaining[char] == 0 or char != word2[len(prefix)]:
+            continue
+        remaining[char] -= 1
+        prefix.append(char)
+        if len(prefix) == len(word2):
+            return True
+        stack.append(sorted(c for c in remaining if remaining[c]))
+    return False
 
 
 def is_anagram_checkoff(word1:str, word2:str)->bool:
@@ -110,6 +164,8 @@ def is_anagram_lettercount(word1:str, word2:str)->bool:
       Approach 2) Create two dictionaries  to keep track of letter counts in each word.
 
       Compare final versions of each list to determine if the words are anagrams.
+      The 26 counts are kept packed in a single integer (see signature.Signature), so the
+      comparison is one integer equality.
       
        Args:
         word1 (str): The first word
@@ -123,24 +179,7 @@ def is_anagram_lettercount(word1:str, word2:str)->bool:
     if (check == False):
         return False
 
-    dictionary1 = {'a': 0, 'b': 0, 'c': 0, 'd': 0, 'e': 0, 'f': 0,
-    'g': 0, 'h': 0, 'i': 0, 'j': 0, 'k': 0, 'l': 0, 'm': 0, 'n': 0,
-    'o': 0, 'p': 0, 'q': 0, 'r': 0, 's': 0, 't': 0, 'u': 0, 'v': 0,
-    'w': 0, 'x': 0, 'y': 0, 'z': 0 }
-
-    dictionary2 = {'a': 0, 'b': 0, 'c': 0, 'd': 0, 'e': 0, 'f': 0,
-    'g': 0, 'h': 0, 'i': 0, 'j': 0, 'k': 0, 'l': 0, 'm': 0, 'n': 0,
-    'o': 0, 'p': 0, 'q': 0, 'r': 0, 's': 0, 't': 0, 'u': 0, 'v': 0,
-    'w': 0, 'x': 0, 'y': 0, 'z': 0 }
-
-    for char in word1:
-        dictionary1[char] = dictionary1[char] + 1
-
-    for char in word2:
-        dictionary2[char] = dictionary2[char] + 1
-    if dictionary1 == dictionary2:
-        return True
-    return False
+    return anagram_key(word1) == anagram_key(word2)
 
 
 def is_anagram_sort_hash(word1:str, word2:str)->bool:
@@ -174,14 +213,19 @@ ch_to_prime = {'a': 2, 'b': 3, 'c': 5, 'd': 7, 'e': 11, 'f': 13,
     'o': 47, 'p': 53, 'q': 59, 'r': 61, 's': 67, 't': 71, 'u': 73, 'v': 79,
     'w': 83, 'x': 89, 'y': 97, 'z': 101 }
 
-def is_anagram_prime_hash(word1:str, word2:str)->bool:
+def is_anagram_prime_hash(word1:str, word2:str, backend:str="prime")->bool:
     '''Create a dictionary of prime numbers (see chToprime above). Use the ascii value of each letter in both
       words to construct a unique numeric representation of the word (called a 'hash').
       Words with the same hash value are anagrams of each other.
 
+      The default "prime" backend multiplies out the full product, which grows without bound on long words.
+      The bounded backends of anagram_lookup.HASH_BACKENDS stay within 128 bits: "packed" is exact for
+      words with at most 15 of each letter, and any other match is confirmed by comparing the sorted letters.
+
        Args:
         word1 (str): The first word
         word2 (str): The second word
+        backend (str): "prime", "packed" or "prime_mod"
 
        Returns:
         bool: True if word1 and word2 are anagrams, False otherwise 
@@ -190,6 +234,13 @@ def is_anagram_prime_hash(word1:str, word2:str)->bool:
     check, word1, word2 = basic_checks(word1, word2)
     if (check == False):
         return False    
+
+    if backend != "prime":
+        hash_function = HASH_BACKENDS[backend]
+        value = hash_function(word1)
+        if value != hash_function(word2):
+            return False
+        return hash_is_exact(backend, value) or sorted(word1) == sorted(word2)
     
     product1 = 1
     product2 = 1
@@ -0,0 +1 @@
+'''Performance benchmarks for Anagame. Run from the repository root, eg. `python -m benchmarks.corpus_load`.'''
@@ -0,0 +1,37 @@
+import statistics
+import subprocess
+import sys
+import time
+
+from word_corpus import convert_word_module
+
+LIST_LOAD = "from valid_anagame_words import get_valid_word_list; words = get_valid_word_list()"
+CORPUS_LOAD = "from word_corpus import get_word_corpus; words = get_word_corpus()"
+
+
+def time_cold_start(statement: str, runs: int) -> list:
+    '''Times a fresh interpreter executing statement, so import and load costs are included.
+
+       Args:
+         statement (str): Python source passed to `python -c`
+         runs (int): Number of interpreter launches
+
+       Returns:
+         list: Wall-clock seconds for each run
+    '''
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    convert_word_module()
+    baseline = statistics.median(time_cold_start("pass", runs))
+    for name, statement in [("list literal", LIST_LOAD), ("mmap corpus", CORPUS_LOAD)]:
+        timings = time_cold_start(statement, runs)
+        median = statistics.median(timings)
+        print(f"{name:>12}: median {median * 1000:7.2f} ms  (+{(median - baseline) * 1000:6.2f} ms over bare interpreter)")
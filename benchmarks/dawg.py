@@ -0,0 +1,57 @@
+import sys
+import time
+import tracemalloc
+
+from AnagramExplorer import AnagramExplorer
+from benchmarks.rack_queries import random_racks
+from dawg import Dawg
+from valid_anagame_words import get_valid_word_list
+from word_corpus import get_word_corpus
+
+RACK_SIZES = [5, 7, 10, 12, 15]
+
+
+def traced_bytes(build) -> tuple:
+    '''Returns (result of build(), bytes it allocated and kept alive).'''
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def report_memory() -> None:
+    #join/split so the strings are fresh objects rather than the constants interned in valid_anagame_words
+    text = "\n".join(get_valid_word_list())
+    words, words_bytes = traced_bytes(lambda: text.split("\n"))
+    explorer = AnagramExplorer(words)
+    lookup, lookup_bytes = traced_bytes(explorer.build_lookup_dict)
+    dawg = Dawg(words)
+    print(f"{len(words)} words")
+    print(f"  list of str:             {words_bytes:>10,} bytes")
+    print(f"  lookup dict of lists:    {lookup_bytes:>10,} bytes (on top of the strings)")
+    print(f"  Dawg, whole corpus:      {dawg.nbytes():>10,} bytes ({dawg.node_count():,} nodes, {len(dawg.labels):,} edges)")
+    print(f"  Dawg, anagram-pair words:{explorer.dawg().nbytes():>10,} bytes ({len(explorer.dawg()):,} words)")
+
+
+def report_queries(count: int) -> None:
+    corpus = get_word_corpus()
+    engines = {engine: AnagramExplorer(corpus, cache_size=0, engine=engine) for engine in ("lookup", "dawg")}
+    engines["dawg"].dawg()
+    print(f"\nget_all_anagrams, {count} uniform racks per size, rack cache disabled")
+    for rack_size in RACK_SIZES:
+        racks = random_racks(count, rack_size, seed=rack_size)
+        timings = {}
+        results = {}
+        for engine, explorer in engines.items():
+            start = time.perf_counter()
+            results[engine] = [explorer.get_all_anagrams(letters) for letters in racks]
+            timings[engine] = (time.perf_counter() - start) / count
+        assert results["lookup"] == results["dawg"]
+        print(f"  {rack_size:>2} letters: lookup {timings['lookup'] * 1e6:>9,.0f} us   dawg {timings['dawg'] * 1e6:>7,.0f} us")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    report_memory()
+    report_queries(count)
@@ -0,0 +1,34 @@
+import statistics
+import sys
+import time
+
+from AnagramExplorer import AnagramExplorer
+from word_corpus import get_word_corpus
+
+
+def time_explorer_build(corpus, runs: int) -> list:
+    '''Times AnagramExplorer construction, which builds the anagram lookup dictionary.
+
+       Args:
+         corpus (Sequence): The words handed to the explorer
+         runs (int): Number of constructions to time
+
+       Returns:
+         list: Wall-clock seconds for each construction
+    '''
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        AnagramExplorer(corpus)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    corpus = list(get_word_corpus())
+    timings = time_explorer_build(corpus, runs)
+    median = statistics.median(timings)
+    print(f"AnagramExplorer build, {len(corpus)} words, {runs} runs")
+    print(f"  median {median * 1000:.2f} ms  min {min(timings) * 1000:.2f} ms  max {max(timings) * 1000:.2f} ms")
+    print(f"  {len(corpus) / median:,.0f} words/sec")
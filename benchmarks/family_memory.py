@@ -0,0 +1,56 @@
+import gc
+import random
+import string
+import time
+import tracemalloc
+
+from AnagramExplorer import AnagramExplorer
+from family_index import build_family_index
+from valid_anagame_words import get_valid_word_list
+from word_corpus import WordCorpus, pack_corpus
+
+
+def retained(build) -> tuple:
+    '''Returns (result of build(), bytes it allocated that are still alive afterwards).'''
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def query_time(explorer: AnagramExplorer, racks: list) -> float:
+    start = time.perf_counter()
+    for letters in racks:
+        explorer.get_all_anagrams(letters)
+        explorer.get_most_anagrams(letters)
+    return (time.perf_counter() - start) / len(racks)
+
+
+if __name__ == "__main__":
+    #join/split so the words are fresh str objects rather than the constants interned in valid_anagame_words
+    text = "\n".join(get_valid_word_list())
+    words, words_bytes = retained(lambda: text.split("\n"))
+    packed, packed_bytes = retained(lambda: WordCorpus(pack_corpus(words)))
+    lookup = AnagramExplorer(words).anagram_lookup
+    _, index_bytes = retained(lambda: build_family_index(lookup, packed))
+    lookup_copy, lookup_bytes = retained(lambda: AnagramExplorer(words).build_lookup_dict())
+
+    print(f"tracemalloc, full corpus ({len(words):,} words, {len(lookup):,} families)")
+    print(f"  corpus as list of str           {words_bytes:>11,} bytes")
+    print(f"  corpus as packed WordCorpus     {packed_bytes:>11,} bytes")
+    print(f"  families as dict of lists       {lookup_bytes:>11,} bytes (plus the str corpus)")
+    print(f"  families as FamilyIndex         {index_bytes:>11,} bytes (plus the packed corpus)")
+
+    explorers = {}
+    for name, build in [("dict-of-lists explorer", lambda: AnagramExplorer(words, cache_size=0)),
+                        ("compact explorer", lambda: AnagramExplorer(words, cache_size=0, compact=True))]:
+        explorers[name], size = retained(build)
+        print(f"  {name:<31} {size:>11,} bytes retained (corpus list not counted)")
+
+    rng = random.Random(0)
+    racks = [rng.choices(string.ascii_lowercase, k=7) for _ in range(1000)]
+    for name, explorer in explorers.items():
+        print(f"  {name:<31} {query_time(explorer, racks) * 1e6:>8.0f} us per get_all_anagrams + get_most_anagrams")
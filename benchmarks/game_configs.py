@@ -0,0 +1,40 @@
+import random
+import statistics
+import sys
+import time
+
+from AnagramExplorer import AnagramExplorer
+from game_config import MIN_WORD_LENGTHS, RACK_SIZES, GameConfig
+from rack_table import draw_rack
+from word_corpus import get_word_corpus
+
+
+def query_latency(explorer: AnagramExplorer, racks: list) -> float:
+    '''Median seconds per get_all_anagrams call.'''
+    timings = []
+    for letters in racks:
+        start = time.perf_counter()
+        explorer.get_all_anagrams(letters)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(count: int) -> None:
+    corpus = get_word_corpus()
+    print(f"get_all_anagrams median latency over {count} scrabble racks per config, rack cache disabled")
+    print(f"{'rack':>4} {'min':>3} {'construct':>10} {'auto':>9} {'lookup':>10}")
+    for rack_size in RACK_SIZES:
+        rng = random.Random(rack_size)
+        racks = [draw_rack("scrabble", rng, rack_size) for _ in range(count)]
+        lookup = AnagramExplorer(corpus, cache_size=0, engine="lookup", config=GameConfig(rack_size, 3))
+        for min_length in MIN_WORD_LENGTHS:
+            start = time.perf_counter()
+            explorer = AnagramExplorer(corpus, cache_size=0, config=GameConfig(rack_size, min_length))
+            construct = time.perf_counter() - start
+            #the sub-rack lookup alone, for comparison, once per rack size
+            baseline = f"{query_latency(lookup, racks) * 1e6:>8,.0f}us" if min_length == 3 else ""
+            print(f"{rack_size:>4} {min_length:>3} {construct * 1000:>8.0f}ms {query_latency(explorer, racks) * 1e6:>7,.0f}us {baseline:>10}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,65 @@
+import asyncio
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from AnagramExplorer import AnagramExplorer
+from game_server import serve
+from word_corpus import get_word_corpus
+
+
+async def client(path: str, guesses_per_game: int, connected: asyncio.Semaphore, go: asyncio.Event,
+                 rng: random.Random, explorer: AnagramExplorer) -> float:
+    '''Connects, waits until every client holds a session, plays guesses_per_game guesses and quits.
+       Returns the seconds from sending the first guess to receiving "bye".'''
+    reader, writer = await asyncio.open_unix_connection(path)
+    letters = (await reader.readline()).decode().split()[1:]
+    await reader.readline()  # time limit
+    words = sorted(explorer.get_all_anagrams(letters)) or ["nope"]
+    connected.release()
+    await go.wait()
+    start = time.perf_counter()
+    for _ in range(guesses_per_game):
+        writer.write(f"{rng.choice(words)},{rng.choice(words)}\n".encode())
+        await reader.readline()
+    writer.write(b"quit\n")
+    while (await reader.readline()).strip() != b"bye":
+        pass
+    writer.close()
+    return time.perf_counter() - start
+
+
+async def run(sessions: int, guesses_per_game: int) -> None:
+    explorer = AnagramExplorer(get_word_corpus())
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "anagame.sock")
+        server = await serve(explorer, unix_path=path, time_limit=600, fun_factor=20)
+        rng = random.Random(0)
+        connected = asyncio.Semaphore(0)
+        go = asyncio.Event()
+        tasks = [asyncio.create_task(client(path, guesses_per_game, connected, go, rng, explorer)) for _ in range(sessions)]
+        start = time.perf_counter()
+        for _ in range(sessions):
+            await connected.acquire()
+        print(f"{sessions} sessions open after {time.perf_counter() - start:.2f} s")
+        start = time.perf_counter()
+        go.set()
+        latencies = sorted(await asyncio.gather(*tasks))
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{sessions} concurrent sessions x {guesses_per_game} guesses: {elapsed:.2f} s, "
+          f"{sessions / elapsed:,.0f} games/s, {sessions * guesses_per_game / elapsed:,.0f} guesses/s")
+    print(f"  per-game p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms, "
+          f"peak RSS {peak_rss:.0f} MB (server and clients in one process)")
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    guesses_per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(run(sessions, guesses_per_game))
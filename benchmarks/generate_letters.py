@@ -0,0 +1,30 @@
+import random
+import statistics
+import sys
+import time
+
+from AnagramExplorer import AnagramExplorer
+from anagame import generate_letters
+from rack_table import get_rack_table
+from word_corpus import get_word_corpus
+
+FUN_FACTORS = [0, 1, 10, 25, 50, 75, 100, 125, 140]
+
+
+if __name__ == "__main__":
+    draws = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    random.seed(0)
+    explorer = AnagramExplorer(get_word_corpus())
+    start = time.perf_counter()
+    table = get_rack_table(explorer)
+    print(f"rack table: {len(table)} playable racks, ready in {(time.perf_counter() - start) * 1000:.1f} ms")
+    for distribution in ["uniform", "scrabble"]:
+        generate_letters(1, distribution, explorer)  # builds the cumulative weights once
+        for fun_factor in FUN_FACTORS:
+            timings = []
+            for _ in range(draws):
+                start = time.perf_counter()
+                generate_letters(fun_factor, distribution, explorer)
+                timings.append(time.perf_counter() - start)
+            print(f"{distribution:>8} fun_factor {fun_factor:>3}: median {statistics.median(timings) * 1e6:6.1f} us  "
+                  f"max {max(timings) * 1e6:7.1f} us  ({table.playable(fun_factor)} racks qualify)")
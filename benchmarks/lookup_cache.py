@@ -0,0 +1,35 @@
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# each child builds one explorer in a fresh interpreter and prints how long construction took
+CHILD = '''
+import time
+from AnagramExplorer import AnagramExplorer
+from word_corpus import get_word_corpus
+corpus = get_word_corpus()
+start = time.perf_counter()
+AnagramExplorer(corpus, lookup_cache_dir={directory!r})
+print(time.perf_counter() - start)
+'''
+
+
+def time_construction(directory, runs: int) -> float:
+    '''Median seconds to construct an AnagramExplorer in a fresh process.'''
+    statement = CHILD.format(directory=directory)
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", statement], check=True, capture_output=True, text=True).stdout
+        timings.append(float(output))
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        time_construction(directory, 1)  # writes the cache
+        build = time_construction(None, runs)
+        load = time_construction(directory, runs)
+    print(f"      build lookup: median {build * 1000:6.1f} ms per explorer")
+    print(f"load cached lookup: median {load * 1000:6.1f} ms per explorer ({build / load:.1f}x)")
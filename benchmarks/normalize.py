@@ -0,0 +1,37 @@
+import random
+import sys
+import timeit
+
+from anagram_race import normalize_word
+
+
+def legacy_normalize(word: str) -> str:
+    '''Reference implementation: the original per-character loop from basic_checks.'''
+    word = word.lower()
+    x = ""
+    for i in range(0, len(word)):
+        if ord(word[i]) <= 122 and ord(word[i]) >= 97:
+            x += word[i]
+    return x
+
+
+def sample_inputs(rng: random.Random) -> dict:
+    ascii_letters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    noisy = ascii_letters + "0123456789 ,.-'!?"
+    non_ascii = "éèêàçñøßüöäåæœ" + "Ω漢字かなДЖ" + ascii_letters
+    return {
+        "short word": "Beast",
+        "short, punctuated": "B-e'ast 2!",
+        "long (1k letters)": "".join(rng.choices(ascii_letters, k=1000)),
+        "long, noisy ascii": "".join(rng.choices(noisy, k=1000)),
+        "long, non-ascii heavy": "".join(rng.choices(non_ascii, k=1000)),
+    }
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, text in sample_inputs(random.Random(0)).items():
+        assert normalize_word(text) == legacy_normalize(text), name
+        legacy = timeit.timeit(lambda: legacy_normalize(text), number=number) / number
+        current = timeit.timeit(lambda: normalize_word(text), number=number) / number
+        print(f"{name:>22}: loop {legacy * 1e6:9.2f} us  translate {current * 1e6:7.2f} us  ({legacy / current:5.1f}x)")
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+from itertools import product
+
+from anagram_lookup import build_prime_hash_dict, build_prime_hash_dict_parallel, build_sorted_hash_dict, build_sorted_hash_dict_parallel
+from word_corpus import get_word_corpus
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def synthetic_corpus(size: int) -> list:
+    '''Grows the game corpus to size words by appending letter suffixes, keeping realistic anagram families.'''
+    base = list(get_word_corpus())
+    words = list(base)
+    for suffix in ("".join(letters) for n in range(1, 4) for letters in product("aeiorstln", repeat=n)):
+        if len(words) >= size:
+            break
+        words.extend(word + suffix for word in base[:size - len(words)])
+    return words[:size]
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    corpus = synthetic_corpus(size)
+    print(f"{len(corpus):,} words, {os.cpu_count()} CPUs available")
+    for name, serial, parallel in [
+        ("sorted hash", build_sorted_hash_dict, build_sorted_hash_dict_parallel),
+        ("prime hash", build_prime_hash_dict, build_prime_hash_dict_parallel),
+    ]:
+        start = time.perf_counter()
+        expected = serial(corpus)
+        baseline = time.perf_counter() - start
+        print(f"{name:>12} serial   : {baseline:6.2f} s")
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            result = parallel(corpus, workers)
+            elapsed = time.perf_counter() - start
+            assert result == expected and list(result) == list(expected), f"{name} parallel build differs"
+            print(f"{name:>12} {workers} worker{'s' if workers > 1 else ' '}: {elapsed:6.2f} s  ({baseline / elapsed:4.2f}x)")
@@ -0,0 +1,34 @@
+import random
+import string
+import sys
+import timeit
+
+from anagram_lookup import HASH_BACKENDS, build_bounded_hash_dict
+from word_corpus import get_word_corpus
+
+
+def synthetic_words(rng: random.Random) -> dict:
+    '''Long words where the unbounded prime product becomes a very large int.'''
+    return {
+        f"{length} random letters": "".join(rng.choices(string.ascii_lowercase, k=length)) for length in (50, 500, 5000)
+    } | {
+        "1000 x z": "z" * 1000,
+    }
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    corpus = list(get_word_corpus())
+    print(f"build_bounded_hash_dict over the full corpus ({len(corpus)} words)")
+    for backend in HASH_BACKENDS:
+        elapsed = timeit.timeit(lambda: build_bounded_hash_dict(corpus, backend), number=number) / number
+        print(f"  {backend:>9}: {elapsed * 1000:7.2f} ms")
+
+    print("\nhash of a single long word")
+    for name, word in synthetic_words(random.Random(0)).items():
+        timings = []
+        for backend, hash_function in HASH_BACKENDS.items():
+            runs = max(1, number * 20)
+            elapsed = timeit.timeit(lambda: hash_function(word), number=runs) / runs
+            timings.append(f"{backend} {elapsed * 1e6:9.1f} us ({hash_function(word).bit_length() if isinstance(hash_function(word), int) else 0:>6} bits)")
+        print(f"  {name:>18}: " + "   ".join(timings))
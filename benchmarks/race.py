@@ -0,0 +1,129 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+
+from anagram_lookup import build_sorted_hash_dict
+from anagram_race import is_anagram_checkoff, is_anagram_exhaustive, is_anagram_lettercount, is_anagram_prime_hash, is_anagram_sort_hash
+from word_corpus import get_word_corpus
+
+ALGORITHMS = [is_anagram_exhaustive, is_anagram_checkoff, is_anagram_lettercount, is_anagram_sort_hash, is_anagram_prime_hash]
+LENGTH_BUCKETS = [(2, 4), (5, 7), (8, 10), (11, 15)]
+
+
+def synthetic_pairs(bucket: tuple, count: int, anagram_ratio: float, rng: random.Random) -> list:
+    '''Random-letter word pairs with lengths in bucket; anagram_ratio of them are shuffles of each other.'''
+    pairs = []
+    for i in range(count):
+        length = rng.randint(*bucket)
+        word1 = "".join(rng.choices(string.ascii_lowercase, k=length))
+        if i < count * anagram_ratio:
+            word2 = "".join(rng.sample(word1, length))
+        else:
+            word2 = "".join(rng.choices(string.ascii_lowercase, k=length))
+        pairs.append((word1, word2))
+    rng.shuffle(pairs)
+    return pairs
+
+
+def corpus_pairs(corpus: list, bucket: tuple, count: int, rng: random.Random) -> list:
+    '''Real word pairs with lengths in bucket: half from the same anagram family, half of equal length but unrelated.
+       The corpus must contain words of some length in bucket.'''
+    families = [words for key, words in build_sorted_hash_dict(corpus).items() if len(words) > 1 and bucket[0] <= len(key) <= bucket[1]]
+    by_length = {}
+    for word in corpus:
+        if bucket[0] <= len(word) <= bucket[1]:
+            by_length.setdefault(len(word), []).append(word)
+    pairs = []
+    for i in range(count):
+        if i % 2 == 0 and families:
+            pairs.append(tuple(rng.sample(rng.choice(families), 2)))
+        else:
+            words = by_length[rng.choice(list(by_length))]
+            pairs.append((rng.choice(words), rng.choice(words)))
+    return pairs
+
+
+def build_cases(count: int, seed: int) -> dict:
+    '''Returns {case name: [(word1, word2), ...]} covering each length bucket and anagram mix.'''
+    rng = random.Random(seed)
+    corpus = list(get_word_corpus())
+    cases = {}
+    for bucket in LENGTH_BUCKETS:
+        name = f"{bucket[0]}-{bucket[1]}"
+        cases[f"len {name}, all anagrams"] = synthetic_pairs(bucket, count, 1.0, rng)
+        cases[f"len {name}, no anagrams"] = synthetic_pairs(bucket, count, 0.0, rng)
+        cases[f"len {name}, 50/50 mix"] = synthetic_pairs(bucket, count, 0.5, rng)
+        if any(bucket[0] <= len(word) <= bucket[1] for word in corpus):
+            cases[f"len {name}, corpus pairs"] = corpus_pairs(corpus, bucket, count, rng)
+    return cases
+
+
+def measure(algorithm, pairs: list, repeat: int) -> dict:
+    '''Times algorithm over pairs, call by call, and records peak traced memory for one pass.'''
+    samples = []
+    for _ in range(repeat):
+        for word1, word2 in pairs:
+            start = time.perf_counter_ns()
+            algorithm(word1, word2)
+            samples.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    for word1, word2 in pairs:
+        algorithm(word1, word2)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    percentile = lambda p: samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+    return {
+        "calls": len(samples),
+        "ops_per_sec": round(len(samples) / (sum(samples) / 1e9), 1),
+        "mean_ns": round(statistics.fmean(samples)),
+        "p50_ns": percentile(50),
+        "p90_ns": percentile(90),
+        "p99_ns": percentile(99),
+        "max_ns": samples[-1],
+        "peak_memory_bytes": peak,
+    }
+
+
+def run(count: int, repeat: int, seed: int) -> dict:
+    results = {}
+    for case, pairs in build_cases(count, seed).items():
+        results[case] = {}
+        for algorithm in ALGORITHMS:
+            results[case][algorithm.__name__] = measure(algorithm, pairs, repeat)
+    return {
+        "meta": {"python": sys.version.split()[0], "platform": platform.platform(), "pairs_per_case": count, "repeat": repeat, "seed": seed},
+        "results": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    for case, algorithms in report["results"].items():
+        print(f"\n{case}")
+        for name, result in algorithms.items():
+            print(f"  {name:<24} {result['ops_per_sec']:>12,.0f} ops/s  p50 {result['p50_ns']:>9,} ns  "
+                  f"p99 {result['p99_ns']:>11,} ns  peak {result['peak_memory_bytes']:>10,} B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the anagram_race checkers.")
+    parser.add_argument("--pairs", type=int, default=200, help="word pairs per case")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over each case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON, for diffing across runs")
+    args = parser.parse_args()
+
+    report = run(args.pairs, args.repeat, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"\nwrote {args.json}")
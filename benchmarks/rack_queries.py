@@ -0,0 +1,92 @@
+import random
+import string
+import sys
+import time
+
+from AnagramExplorer import AnagramExplorer
+from rack_matrix import numpy_available
+from word_corpus import get_word_corpus
+
+
+def scan_all_anagrams(explorer: AnagramExplorer, letters: list) -> set:
+    '''Reference implementation: the original full scan over every anagram_lookup family.'''
+    result = set()
+    for anagrams in explorer.anagram_lookup.values():
+        letters_list = letters.copy()
+        is_valid = True
+        for letter in anagrams[0]:
+            if letter not in letters_list:
+                is_valid = False
+            else:
+                letters_list.remove(letter)
+        if len(anagrams) > 1 and is_valid and len(anagrams[0]) > 2:
+            result.update(anagrams)
+    return result
+
+
+def scan_most_anagrams(explorer: AnagramExplorer, letters: list) -> str:
+    '''Reference implementation: the original full scan for the largest fitting family.'''
+    max_anagram = ""
+    max_length = 0
+    for anagrams in explorer.anagram_lookup.values():
+        letters_list = letters.copy()
+        is_valid = True
+        if len(anagrams) > max_length:
+            for letter in anagrams[0]:
+                if letter not in letters_list:
+                    is_valid = False
+                else:
+                    letters_list.remove(letter)
+            if is_valid:
+                max_length = len(anagrams)
+                max_anagram = anagrams[0]
+    return max_anagram
+
+
+def random_racks(count: int, rack_size: int = 7, seed: int = 0) -> list:
+    '''Draws count racks of uniformly random lowercase letters, with replacement.'''
+    rng = random.Random(seed)
+    return [rng.choices(string.ascii_lowercase, k=rack_size) for _ in range(count)]
+
+
+def time_queries(query, racks: list) -> tuple:
+    '''Runs query over every rack.
+
+       Returns:
+         tuple: (results in rack order, elapsed seconds)
+    '''
+    start = time.perf_counter()
+    results = [query(rack) for rack in racks]
+    return results, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    explorer = AnagramExplorer(get_word_corpus(), cache_size=0)
+    racks = random_racks(count)
+    pairs = [
+        ("get_all_anagrams", lambda rack: scan_all_anagrams(explorer, rack), explorer.get_all_anagrams),
+        ("get_most_anagrams", lambda rack: scan_most_anagrams(explorer, rack), explorer.get_most_anagrams),
+    ]
+    print(f"{count} random 7-letter racks, {len(explorer.anagram_lookup)} families")
+    for name, legacy, current in pairs:
+        legacy_results, legacy_time = time_queries(legacy, racks)
+        current_results, current_time = time_queries(current, racks)
+        assert legacy_results == current_results, f"{name} output differs from the full scan"
+        print(f"{name:>18}: scan {legacy_time / count * 1e6:9.1f} us/rack  "
+              f"sub-rack {current_time / count * 1e6:7.1f} us/rack  ({legacy_time / current_time:.0f}x)")
+
+    batches = [
+        ("get_all_anagrams", explorer.get_all_anagrams, explorer.get_all_anagrams_batch),
+        ("get_most_anagrams", explorer.get_most_anagrams, explorer.get_most_anagrams_batch),
+        ("get_top_families", explorer.get_top_families, explorer.get_top_families_batch),
+    ]
+    engine = "numpy matrix" if numpy_available() else "pure-Python fallback"
+    explorer.get_most_anagrams_batch(racks[:1])  # builds the family matrix outside the timings
+    for name, single, batch in batches:
+        single_results, single_time = time_queries(single, racks)
+        start = time.perf_counter()
+        batch_results = batch(racks)
+        batch_time = time.perf_counter() - start
+        assert single_results == batch_results, f"{name}_batch output differs from {name}"
+        print(f"{name + '_batch':>24}: {batch_time / count * 1e6:7.1f} us/rack ({engine}) vs {single_time / count * 1e6:7.1f} us/rack one at a time")
@@ -0,0 +1,64 @@
+import random
+import sys
+import time
+
+from AnagramExplorer import AnagramExplorer
+from anagame import calc_stats, generate_letters, validate_games
+from word_corpus import get_word_corpus
+
+
+def legacy_calc_stats(guesses: list, letters: list, explorer) -> dict:
+    '''Reference implementation: the original calc_stats, with its list-membership duplicate check.'''
+    stats = {"valid": [], "invalid": [], "score": 0, "accuracy": 0, "skill": 0}
+    all_possible_anagrams = set(explorer.get_all_anagrams(letters))
+    unique_valid_guesses = set()
+    for guess in guesses:
+        word1, word2 = guess
+        if word1 in all_possible_anagrams and word2 in all_possible_anagrams and word1 != word2:
+            if guess not in stats["valid"]:
+                stats["valid"].append(guess)
+                unique_valid_guesses.update(guess)
+                stats["score"] += 1
+            else:
+                stats["invalid"].append(guess)
+        else:
+            stats["invalid"].append(guess)
+    if guesses:
+        stats["accuracy"] = int((len(stats["valid"]) / len(guesses)) * 100)
+    stats["guessed"] = unique_valid_guesses
+    stats["not guessed"] = all_possible_anagrams - unique_valid_guesses
+    if all_possible_anagrams:
+        stats["skill"] = int((len(unique_valid_guesses) / len(all_possible_anagrams)) * 100)
+    return stats
+
+
+def synthetic_games(explorer: AnagramExplorer, count: int, guesses_per_game: int, seed: int = 0) -> list:
+    '''Builds (guesses, letters) game logs mixing valid, repeated and invalid guesses.'''
+    rng = random.Random(seed)
+    racks = [generate_letters(20, "scrabble", explorer) for _ in range(max(1, count // 10))]
+    games = []
+    for _ in range(count):
+        letters = rng.choice(racks)
+        words = sorted(explorer.get_all_anagrams(letters)) + ["zzz", "qqq"]
+        guesses = [(rng.choice(words), rng.choice(words)) for _ in range(guesses_per_game)]
+        games.append((guesses, letters))
+    return games
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    guesses_per_game = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    random.seed(0)
+    games = synthetic_games(AnagramExplorer(get_word_corpus()), count, guesses_per_game)
+    print(f"replaying {count} games of {guesses_per_game} guesses")
+    for name, replay in [
+        ("legacy calc_stats", lambda explorer: [legacy_calc_stats(g, l, explorer) for g, l in games]),
+        ("calc_stats", lambda explorer: [calc_stats(g, l, explorer) for g, l in games]),
+        ("validate_games", lambda explorer: validate_games(games, explorer)),
+    ]:
+        explorer = AnagramExplorer(get_word_corpus(), cache_size=0)
+        explorer.get_all_anagrams_batch([[]])  # family matrix build is a one-off per explorer
+        start = time.perf_counter()
+        replay(explorer)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>18}: {elapsed:7.3f} s  ({count / elapsed:,.0f} games/sec)")
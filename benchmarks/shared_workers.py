@@ -0,0 +1,65 @@
+import multiprocessing
+import random
+import statistics
+import string
+import sys
+
+MODES = ("private", "shared")
+
+
+def memory_kb() -> dict:
+    '''This process's Rss, Pss (shared pages split between the processes mapping them) and private memory, in kB.'''
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {"rss": fields["Rss"], "pss": fields["Pss"], "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def worker(mode: str, queries: int, barrier, results) -> None:
+    '''One game worker: builds its explorer, answers some rack queries, then reports its memory
+       once every worker is up, so shared pages are counted across all of them.'''
+    from AnagramExplorer import AnagramExplorer
+    from family_index import get_family_index
+    from word_corpus import get_word_corpus
+
+    corpus = get_word_corpus()
+    if mode == "shared":
+        explorer = AnagramExplorer(corpus, family_index=get_family_index(corpus))
+    else:
+        explorer = AnagramExplorer(corpus)
+    rng = random.Random(0)
+    for _ in range(queries):
+        explorer.get_all_anagrams(rng.choices(string.ascii_lowercase, k=7))
+    barrier.wait()
+    results.put(memory_kb())
+    barrier.wait()
+
+
+def run(mode: str, workers: int, queries: int) -> dict:
+    '''Starts workers fresh interpreters in mode and returns the median of their memory reports.'''
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, queries, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in range(workers)]
+    for process in processes:
+        process.join()
+    return {field: statistics.median(report[field] for report in reports) for field in reports[0]}
+
+
+if __name__ == "__main__":
+    from family_index import get_family_index
+    from word_corpus import get_word_corpus
+
+    get_family_index(get_word_corpus())  # write the index file once, before any worker maps it
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, 32]
+    print("median per-worker memory, kB (Pss splits shared pages between the workers mapping them)")
+    for workers in counts:
+        for mode in MODES:
+            memory = run(mode, workers, 200)
+            print(f"  {workers:>2} workers, {mode:<7}  Rss {memory['rss']:>7,.0f}  Pss {memory['pss']:>7,.0f}  private {memory['private']:>7,.0f}")
@@ -0,0 +1,43 @@
+import re
+import statistics
+import subprocess
+import sys
+
+MODULES = ["anagame", "AnagramExplorer", "game_server", "word_corpus", "rack_table", "anagram_race"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_time(module: str, runs: int) -> tuple:
+    '''Imports module in fresh interpreters under -X importtime.
+
+       Returns:
+         tuple: (median cumulative microseconds for the module itself, sorted names of every module it pulled in)
+    '''
+    timings = []
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                check=True, capture_output=True, text=True).stderr
+        imported = {}
+        for match in IMPORT_LINE.finditer(stderr):
+            imported[match.group(4)] = int(match.group(2))
+        timings.append(imported[module])
+    return statistics.median(timings), sorted(imported)
+
+
+def first_corpus_access(runs: int) -> float:
+    '''Median microseconds for the first get_word_corpus() call in a fresh process (the deferred corpus load).'''
+    statement = ("import time; from word_corpus import get_word_corpus; start = time.perf_counter(); "
+                 "get_word_corpus(); print(time.perf_counter() - start)")
+    timings = [float(subprocess.run([sys.executable, "-c", statement], check=True, capture_output=True, text=True).stdout)
+               for _ in range(runs)]
+    return statistics.median(timings) * 1e6
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    print(f"python -X importtime, median of {runs} fresh interpreters")
+    for module in MODULES:
+        median, imported = import_time(module, runs)
+        heavy = [name for name in ("numpy", "concurrent.futures.process", "valid_anagame_words", "AnagramExplorer") if name in imported]
+        print(f"  import {module:<16} {median / 1000:7.1f} ms   pulls in: {', '.join(heavy) or '-'}")
+    print(f"  first get_word_corpus()  {first_corpus_access(runs) / 1000:7.1f} ms")
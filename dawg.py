@@ -0,0 +1,236 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+DAWG_MAGIC = b"ANAGDAWG"
+DAWG_VERSION = 1
+# magic, version, reserved, node count, edge count, word count, crc32 of the body
+HEADER = struct.Struct("<8sHHIIII")
+
+
+class Dawg:
+    '''A set of lowercase a-z words stored as a minimal directed acyclic word graph.
+
+       Words sharing a prefix share the path from the root, and words sharing a suffix share the path
+       to the end, so the corpus fits in a few flat arrays instead of one Python string per word:
+         edge_start - node count + 1 offsets: node n's edges are edge_start[n] to edge_start[n + 1]
+         labels     - the letter index (0-25) of each edge, sorted within a node
+         targets    - the node each edge leads to
+         final      - 1 for nodes that end a word
+       Node 0 is the root.
+
+       formable() walks the graph depth-first while spending letters from a rack, so a branch is
+       abandoned as soon as the rack runs out of its next letter. Its cost follows the corpus words
+       reachable from the rack, not the 2^len(rack) sub-multisets of the rack.
+
+       Example
+       -------
+       >>> dawg = Dawg(["rat", "tar", "art", "stop", "pots", "tops"])
+       >>> sorted(dawg.formable(["p", "o", "t", "s", "r", "i", "a"]))
+       ['art', 'pots', 'rat', 'stop', 'tar', 'tops']
+    '''
+
+    def __init__(self, words=(), *, edge_start: array = None, labels: bytes = None, targets: array = None,
+                 final: bytes = None, word_count: int = None):
+        if edge_start is None:
+            edge_start, labels, targets, final, word_count = self.__build(words)
+        self.edge_start = edge_start
+        self.labels = labels
+        self.targets = targets
+        self.final = final
+        self.word_count = word_count
+
+    @staticmethod
+    def __build(words) -> tuple:
+        '''Builds the minimal graph incrementally from the sorted words (Daciuk et al., 2000).'''
+        edges = [{}]       # per node: {letter index: child node}
+        finals = [False]
+        register = {}      # (final, edges) of every minimized node -> that node
+        unchecked = []     # (parent, letter, child) along the last word, not yet minimized
+        previous = ""
+        word_count = 0
+
+        def minimize(down_to: int) -> None:
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = (finals[child], tuple(sorted(edges[child].items())))
+                if key in register:
+                    edges[parent][letter] = register[key]
+                else:
+                    register[key] = child
+
+        for word in sorted(set(words)):
+            indexes = [ord(letter) - 97 for letter in word]
+            if not word or not all(0 <= index < 26 for index in indexes):
+                raise ValueError(f"a Dawg only holds non-empty words of the letters a-z, got {word!r}")
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else 0
+            for index in indexes[common:]:
+                edges.append({})
+                finals.append(False)
+                child = len(edges) - 1
+                edges[node][index] = child
+                unchecked.append((node, index, child))
+                node = child
+            finals[node] = True
+            previous = word
+            word_count += 1
+        minimize(0)
+
+        #renumber the nodes still reachable from the root and flatten their edges
+        numbering = {0: 0}
+        order = [0]
+        for node in order:
+            for child in edges[node].values():
+                if child not in numbering:
+                    numbering[child] = len(order)
+                    order.append(child)
+        edge_start = array("I", [0])
+        labels = bytearray()
+        targets = array("I")
+        for node in order:
+            for letter, child in sorted(edges[node].items()):
+                labels.append(letter)
+                targets.append(numbering[child])
+            edge_start.append(len(labels))
+        final = bytes(finals[node] for node in order)
+        return edge_start, bytes(labels), targets, final, word_count
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def node_count(self) -> int:
+        return len(self.final)
+
+    def __child(self, node: int, index: int) -> int:
+        for edge in range(self.edge_start[node], self.edge_start[node + 1]):
+            if self.labels[edge] == index:
+                return self.targets[edge]
+        return -1
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str) or not word:
+            return False
+        node = 0
+        for letter in word:
+            node = self.__child(node, ord(letter) - 97)
+            if node < 0:
+                return False
+        return bool(self.final[node])
+
+    def __iter__(self):
+        '''Yields every word, in sorted order.'''
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self.final[node]:
+                yield prefix
+            for edge in reversed(range(self.edge_start[node], self.edge_start[node + 1])):
+                stack.append((self.targets[edge], prefix + ALPHABET[self.labels[edge]]))
+
+    def formable(self, letters, min_length: int = 1) -> list:
+        '''Returns every word that can be spelled with the rack's letters, each rack tile used at most once.
+
+           Args:
+             letters (list): The rack; letters outside a-z are ignored
+             min_length (int): Shortest word to return
+
+           Returns:
+             list: The formable words, in sorted order
+        '''
+        counts = [0] * len(ALPHABET)
+        for letter in letters:
+            index = ord(letter) - 97 if len(letter) == 1 else -1
+            if 0 <= index < 26:
+                counts[index] += 1
+        edge_start, labels, targets, final = self.edge_start, self.labels, self.targets, self.final
+        found = []
+        path = []
+
+        def visit(node: int) -> None:
+            if final[node] and len(path) >= min_length:
+                found.append("".join(path))
+            for edge in range(edge_start[node], edge_start[node + 1]):
+                index = labels[edge]
+                if counts[index]:
+                    counts[index] -= 1
+                    path.append(ALPHABET[index])
+                    visit(targets[edge])
+                    path.pop()
+                    counts[index] += 1
+
+        visit(0)
+        return found
+
+    def nbytes(self) -> int:
+        '''Bytes used by the graph's arrays.'''
+        return (self.edge_start.itemsize * len(self.edge_start) + len(self.labels)
+                + self.targets.itemsize * len(self.targets) + len(self.final))
+
+    def to_bytes(self) -> bytes:
+        columns = [array("I", self.edge_start), array("I", self.targets)]
+        if sys.byteorder != "little":
+            for column in columns:
+                column.byteswap()
+        body = columns[0].tobytes() + self.labels + columns[1].tobytes() + self.final
+        header = HEADER.pack(DAWG_MAGIC, DAWG_VERSION, 0, len(self.final), len(self.labels), self.word_count, zlib.crc32(body))
+        return header + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Dawg":
+        '''Parses a graph written by to_bytes().
+
+           Raises:
+             ValueError: If the data is corrupt or from an unknown format version
+        '''
+        if len(data) < HEADER.size:
+            raise ValueError("dawg is shorter than its header")
+        magic, version, _, nodes, edges, word_count, crc = HEADER.unpack_from(data, 0)
+        if magic != DAWG_MAGIC or version != DAWG_VERSION:
+            raise ValueError(f"not a version {DAWG_VERSION} dawg")
+        body = memoryview(data)[HEADER.size:]
+        if len(body) != 4 * (nodes + 1) + edges + 4 * edges + nodes or zlib.crc32(body) != crc:
+            raise ValueError("dawg checksum mismatch")
+        edge_start = array("I")
+        edge_start.frombytes(body[:4 * (nodes + 1)])
+        start = 4 * (nodes + 1)
+        labels = bytes(body[start:start + edges])
+        start += edges
+        targets = array("I")
+        targets.frombytes(body[start:start + 4 * edges])
+        final = bytes(body[start + 4 * edges:])
+        if sys.byteorder != "little":
+            edge_start.byteswap()
+            targets.byteswap()
+        return cls(edge_start=edge_start, labels=labels, targets=targets, final=final, word_count=word_count)
+
+
+def save_dawg(dawg: Dawg, path: str) -> str:
+    '''Writes a graph atomically, returning the path written.'''
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dawg.to_bytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_dawg(path: str) -> Dawg:
+    '''Reads a graph written by save_dawg().'''
+    with open(path, "rb") as f:
+        return Dawg.from_bytes(f.read())
+
+
+if __name__ == "__main__":
+    from valid_anagame_words import get_valid_word_list
+
+    out_path = sys.argv[1] if len(sys.argv) > 1 else "valid_anagame_words.dawg"
+    dawg = Dawg(get_valid_word_list())
+    save_dawg(dawg, out_path)
+    print(f"Wrote {len(dawg)} words as {dawg.node_count()} nodes, {len(dawg.labels)} edges ({dawg.nbytes():,} bytes) to {out_path}")
@@ -0,0 +1,296 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Mapping, Sequence
+
+from signature import ALPHABET, Signature
+from word_corpus import WordCorpus, corpus_checksum, pack_corpus
+
+INDEX_MAGIC = b"ANAGFAMS"
+INDEX_VERSION = 1
+# magic, version, reserved, family count, member count, slot count, corpus checksum, crc32 of the body
+HEADER = struct.Struct("<8sHHIIIII")
+KEY_BYTES = len(ALPHABET)  # a Signature's 26 one-byte letter counts
+_MIX = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "valid_anagame_words.families")
+
+
+def _slot(key: int, slot_bits: int) -> int:
+    # Fibonacci hashing of the int hash, which (unlike str hashes) is the same in every process
+    return ((hash(key) * _MIX) & _MASK64) >> (64 - slot_bits)
+
+
+def pack_family_index(lookup: dict, corpus) -> bytes:
+    '''Packs an anagram lookup dictionary into the family index format.
+
+       Layout (all integers little-endian):
+         header  - see HEADER
+         keys    - family count x 26 bytes: each family's Signature, one letter count per byte
+         starts  - family count + 1 uint32 offsets into members
+         members - uint32 corpus positions of each family's words, family by family
+         slots   - open-addressing hash table of family number + 1 (0 marks an empty slot)
+
+       Args:
+         lookup (dict): Signature keys to lists of corpus words, eg. AnagramExplorer.anagram_lookup
+         corpus (Sequence): The sorted corpus the words come from; the index stores positions in it
+
+       Returns:
+         bytes: The packed index
+
+       Raises:
+         ValueError: If a key isn't a Signature or a word isn't in the corpus
+    '''
+    positions = {word: i for i, word in enumerate(corpus)}
+    keys = bytearray()
+    starts = array("I", [0])
+    members = array("I")
+    for key, anagrams in lookup.items():
+        if not isinstance(key, Signature):
+            raise ValueError(f"family indexes only hold Signature keys, got {key!r}")
+        keys += int(key).to_bytes(KEY_BYTES, "little")
+        members.extend(positions[word] for word in anagrams)
+        starts.append(len(members))
+    slot_bits = max(1, (2 * len(lookup) - 1).bit_length())  # at most half full
+    slots = array("I", bytes(4 << slot_bits))
+    for family, key in enumerate(lookup):
+        slot = _slot(key, slot_bits)
+        while slots[slot]:
+            slot = (slot + 1) & ((1 << slot_bits) - 1)
+        slots[slot] = family + 1
+    columns = [starts, members, slots]
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+    body = bytes(keys) + b"".join(column.tobytes() for column in columns)
+    header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(lookup), len(members), len(slots),
+                         corpus_checksum(corpus), zlib.crc32(body))
+    return header + body
+
+
+class FamilyIndex(Mapping):
+    '''A read-only anagram lookup dictionary backed by a packed buffer, usually a memory-mapped file.
+
+       Behaves like AnagramExplorer.anagram_lookup (Signature -> sorted list of anagrams, in the same
+       order), but the families live in the buffer instead of in per-process dicts and lists, so every
+       process mapping the same file shares one copy. Families are returned as Family views, whose
+       words are read from the corpus only when accessed.
+    '''
+
+    def __init__(self, buffer, corpus, checksum_verified: bool = False):
+        if len(buffer) < HEADER.size:
+            raise ValueError("family index is shorter than its header")
+        magic, version, _, families, member_count, slot_count, checksum, crc = HEADER.unpack_from(buffer, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError(f"not a version {INDEX_VERSION} family index")
+        if checksum != corpus_checksum(corpus):
+            raise ValueError("family index was built from a different corpus")
+        keys_end = HEADER.size + KEY_BYTES * families
+        starts_end = keys_end + 4 * (families + 1)
+        members_end = starts_end + 4 * member_count
+        if len(buffer) != members_end + 4 * slot_count or slot_count & (slot_count - 1):
+            raise ValueError("family index length does not match its header")
+        view = memoryview(buffer)
+        if not checksum_verified and zlib.crc32(view[HEADER.size:]) != crc:
+            raise ValueError("family index checksum mismatch")
+
+        self._buffer = buffer
+        self._keys = view[HEADER.size:keys_end]
+        columns = [view[keys_end:starts_end], view[starts_end:members_end], view[members_end:]]
+        if sys.byteorder == "little":
+            self._starts, self._members, self._slots = (column.cast("I") for column in columns)
+        else:
+            self._starts, self._members, self._slots = (array("I", column) for column in columns)
+            for column in (self._starts, self._members, self._slots):
+                column.byteswap()
+        self._count = families
+        self._slot_bits = slot_count.bit_length() - 1
+        self.corpus = corpus
+        self.checksum = checksum
+
+    def __len__(self) -> int:
+        return self._count
+
+    def key(self, family: int) -> Signature:
+        '''The Signature of the family-th family.'''
+        return Signature(int.from_bytes(self._keys[KEY_BYTES * family:KEY_BYTES * (family + 1)], "little"))
+
+    def rank(self, key) -> int:
+        '''Returns the position of key's family in lookup dictionary order, or -1 if there's no such family.'''
+        if not isinstance(key, Signature):
+            return -1
+        slots, keys, slot_bits = self._slots, self._keys, self._slot_bits
+        slot = _slot(key, slot_bits)
+        family = slots[slot] - 1
+        if family < 0:
+            return -1
+        packed = int(key).to_bytes(KEY_BYTES, "little")
+        mask = (1 << slot_bits) - 1
+        while family >= 0:
+            if keys[KEY_BYTES * family:KEY_BYTES * (family + 1)] == packed:
+                return family
+            slot = (slot + 1) & mask
+            family = slots[slot] - 1
+        return -1
+
+    def family(self, family: int) -> "Family":
+        '''The words of the family-th family, as a list-like view.'''
+        return Family(self, self._starts[family], self._starts[family + 1])
+
+    def first_member(self, family: int) -> int:
+        '''The corpus position of the family-th family's first word.'''
+        return self._members[self._starts[family]]
+
+    def family_size(self, family: int) -> int:
+        return self._starts[family + 1] - self._starts[family]
+
+    def __getitem__(self, key) -> "Family":
+        family = self.rank(key)
+        if family < 0:
+            raise KeyError(key)
+        return self.family(family)
+
+    def get(self, key, default=None):
+        family = self.rank(key)
+        return default if family < 0 else self.family(family)
+
+    def __contains__(self, key) -> bool:
+        return self.rank(key) >= 0
+
+    def __iter__(self):
+        return (self.key(family) for family in range(self._count))
+
+    def items(self):
+        return ((self.key(family), self.family(family)) for family in range(self._count))
+
+    def values(self):
+        return (self.family(family) for family in range(self._count))
+
+    def playable(self, min_length: int) -> "PlayableFamilies":
+        '''The families that form anagram pairs of at least min_length letters, as AnagramExplorer keeps per GameConfig.'''
+        return PlayableFamilies(self, min_length)
+
+    def __repr__(self) -> str:
+        return f"FamilyIndex({self._count} families, crc32={self.checksum:#010x})"
+
+
+class Family(Sequence):
+    '''One family of a FamilyIndex: a read-only, list-like view of a range of the index's members.
+       Compares equal to a list or tuple of the same words.
+    '''
+
+    __slots__ = ("_index", "_start", "_stop")
+
+    def __init__(self, index: FamilyIndex, start: int, stop: int):
+        self._index = index
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("family index out of range")
+        return self._index.corpus[self._index._members[self._start + i]]
+
+    def __iter__(self):
+        corpus = self._index.corpus
+        return (corpus[i] for i in self._index._members[self._start:self._stop])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Family, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Family({list(self)!r})"
+
+
+class PlayableFamilies:
+    '''A filtered view of a FamilyIndex: only families of 2+ words with at least min_length letters.
+
+       The view keeps just the set of playable keys (a few thousand ints), so the sub-racks that
+       match no playable family, the vast majority, are rejected without touching the index.
+    '''
+
+    def __init__(self, index: FamilyIndex, min_length: int):
+        self.index = index
+        self.min_length = min_length
+        self.__families = [family for family in range(len(index))
+                           if index.family_size(family) > 1 and len(index.corpus[index.first_member(family)]) >= min_length]
+        self.__keys = frozenset(map(index.key, self.__families))
+
+    def get(self, key, default=None):
+        if key not in self.__keys:
+            return default
+        return self.index.family(self.index.rank(key))
+
+    def values(self):
+        return map(self.index.family, self.__families)
+
+
+def build_family_index(lookup: dict, corpus) -> FamilyIndex:
+    '''Packs a lookup dictionary into an in-memory FamilyIndex, the compact alternative to a dict of lists.
+       A plain word list is packed into a WordCorpus too, so the words are one buffer instead of one str each.
+
+       Args:
+         lookup (dict): Signature keys to lists of corpus words, eg. AnagramExplorer.build_lookup_dict()
+         corpus (Sequence): The words the lookup was built from
+
+       Returns:
+         FamilyIndex: An index over corpus, or over its packed copy
+    '''
+    if not isinstance(corpus, WordCorpus):
+        corpus = WordCorpus(pack_corpus(corpus))
+    return FamilyIndex(pack_family_index(lookup, corpus), corpus, checksum_verified=True)
+
+
+def write_family_index(lookup: dict, corpus, path: str = DEFAULT_PATH) -> str:
+    '''Writes a family index atomically, returning the path written.'''
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pack_family_index(lookup, corpus))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_family_index(corpus, path: str = DEFAULT_PATH) -> FamilyIndex:
+    '''Memory-maps a family index written by write_family_index() for this corpus.
+
+       Raises:
+         ValueError: If the file is corrupt, from an unknown format version, or built from another corpus
+    '''
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return FamilyIndex(buffer, corpus)
+
+
+def get_family_index(corpus, path: str = DEFAULT_PATH) -> FamilyIndex:
+    '''Returns the family index for corpus, memory-mapping path when it matches and otherwise
+       building it from the corpus (and writing it to path first).
+
+       Args:
+         corpus (WordCorpus): The shared corpus, usually get_word_corpus()
+         path (str): Index file location
+
+       Returns:
+         FamilyIndex: Pages shared with every other process that maps the same file
+    '''
+    try:
+        return load_family_index(corpus, path)
+    except (OSError, ValueError):
+        pass
+    from AnagramExplorer import AnagramExplorer
+    write_family_index(AnagramExplorer(corpus, cache_size=0).anagram_lookup, corpus, path)
+    return load_family_index(corpus, path)
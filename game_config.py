@@ -0,0 +1,32 @@
+from collections import namedtuple
+
+RACK_SIZES = range(5, 13)
+MIN_WORD_LENGTHS = range(2, 6)
+
+GameConfig = namedtuple("GameConfig", ["rack_size", "min_length"])
+GameConfig.__doc__ = '''The variant of the game being played.
+
+   Args:
+     rack_size (int): Letters per rack, 5 to 12
+     min_length (int): Shortest word that counts towards an anagram pair, 2 to 5
+'''
+
+DEFAULT_CONFIG = GameConfig(rack_size=7, min_length=3)
+
+#tiles of each letter in an English scrabble bag (blanks left out), the "scrabble" letter distribution
+SCRABBLE_TILES = {'a': 9, 'b': 2, 'c': 2, 'd': 4, 'e': 12, 'f': 2, 'g': 3, 'h': 2, 'i': 9, 'j': 1, 'k': 1, 'l': 4, 'm': 2,
+    'n': 6, 'o': 8, 'p': 2, 'q': 1, 'r': 6, 's': 4, 't': 6, 'u': 4, 'v': 2, 'w': 2, 'x': 1, 'y': 2, 'z': 1}
+
+
+def check_config(config: GameConfig) -> GameConfig:
+    '''Returns config if it is a supported variant.
+
+       Raises:
+         ValueError: If the rack size or minimum word length is out of range
+    '''
+    rack_size, min_length = config
+    if rack_size not in RACK_SIZES:
+        raise ValueError(f"rack size must be between {RACK_SIZES[0]} and {RACK_SIZES[-1]}, got {rack_size}")
+    if min_length not in MIN_WORD_LENGTHS:
+        raise ValueError(f"minimum word length must be between {MIN_WORD_LENGTHS[0]} and {MIN_WORD_LENGTHS[-1]}, got {min_length}")
+    return GameConfig(rack_size, min_length)
@@ -0,0 +1,205 @@
+'''Line protocol, one UTF-8 line per message in each direction.
+
+   Server to client:
+     letters <letters, space separated>   sent once when the session starts
+     time <seconds>                       time limit for the session
+     ok <word1>,<word2> <label> <score>   guess recorded; label is valid, invalid or duplicate, score the running total
+     error <message>                      line was not a guess or a command; nothing recorded.
+                                          Also sent, followed by closing the connection, if no rack could be drawn
+     hint <size> <letters, space separated>   the next anagram family not yet found, see HintEngine
+     hint none                            every family has been found or hinted
+     stats <json>                         calc_stats result, sent when the game ends (sets as sorted lists)
+     bye
+
+   Client to server:
+     <word1>,<word2>                      a guess, in the format accepted by anagame.parse_guess
+     hint
+     quit                                 ends the game early
+'''
+
+from __future__ import annotations
+import asyncio
+import json
+import os
+from functools import partial
+
+from AnagramExplorer import AnagramExplorer
+from anagame import generate_letters, parse_guess
+from game_config import DEFAULT_CONFIG, GameConfig
+from guess_scorer import GuessScorer
+from hint_engine import STRATEGIES, HintEngine
+from lookup_cache import DEFAULT_DIR as DEFAULT_LOOKUP_CACHE_DIR
+from rack_table import MAX_TABLE_RACK_SIZE, draw_playable_rack, get_rack_table
+from word_corpus import get_word_corpus
+
+DEFAULT_TIME_LIMIT = 60
+DEFAULT_FUN_FACTOR = 100
+DEFAULT_DISTRIBUTION = "scrabble"
+MAX_LINE_BYTES = 1024
+BACKLOG = 4096
+
+
+def encode_stats(stats: dict) -> str:
+    '''Renders a calc_stats dictionary as a single line of JSON, with its sets as sorted lists.'''
+    return json.dumps({key: sorted(value) if isinstance(value, set) else value for key, value in stats.items()})
+
+
+async def play_session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, explorer: AnagramExplorer,
+                       time_limit: float = DEFAULT_TIME_LIMIT, fun_factor: int = DEFAULT_FUN_FACTOR,
+                       distribution: str = DEFAULT_DISTRIBUTION, hint_strategy: str = "smallest") -> list:
+    '''Plays a single game of AnaGame with one connected client: the network form of anagame.play_game.
+
+       The session's time limit is a deadline on the event loop's monotonic clock, and each read waits
+       only for the time remaining, so an idle client costs nothing until it sends a line or runs out of time.
+       Each guess is scored as it arrives (see GuessScorer), so the end of a round only has to send the stats.
+
+       Args:
+         reader (asyncio.StreamReader): Lines from the client
+         writer (asyncio.StreamWriter): Lines to the client
+         explorer (AnagramExplorer): helper object shared by every session
+         time_limit (float): Time limit in seconds
+         fun_factor (int): minimum number of unique anagram words offered by the rack
+         distribution (str): "uniform" or "scrabble", as in anagame.generate_letters
+         hint_strategy (str): Order of the families served by the hint command, see HintEngine
+
+       Returns:
+         list: A list of tuples representing all player guesses
+    '''
+    loop = asyncio.get_running_loop()
+    scorer = None
+
+    def send(line: str) -> None:
+        writer.write(line.encode() + b"\n")
+
+    try:
+        try:
+            if explorer.config.rack_size > MAX_TABLE_RACK_SIZE:
+                #racks too large to tabulate are drawn by rejection sampling, which can take thousands of
+                #get_all_anagrams calls, so the draw runs on a worker thread instead of stalling every session
+                letters = await loop.run_in_executor(None, generate_letters, fun_factor, distribution, explorer)
+            else:
+                letters = generate_letters(fun_factor, distribution, explorer)
+        except ValueError as error:  # no rack meets fun_factor
+            send(f"error {error}")
+            await writer.drain()
+            return []
+        scorer = GuessScorer(letters, explorer)
+        hints = HintEngine(letters, explorer, hint_strategy, scorer.all_possible_anagrams)
+        send(f"letters {' '.join(letters)}")
+        send(f"time {time_limit:g}")
+        deadline = loop.time() + time_limit
+        overlong = False
+        while True:
+            await writer.drain()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                line = await asyncio.wait_for(reader.readuntil(b"\n"), remaining)
+            except asyncio.TimeoutError:
+                break
+            except asyncio.IncompleteReadError as error:
+                if not error.partial:  # client closed the connection
+                    break
+                line = error.partial
+            except asyncio.LimitOverrunError as error:
+                #drop what's buffered, then the rest of the line once its newline arrives
+                await reader.readexactly(error.consumed)
+                overlong = True
+                continue
+            if overlong:
+                overlong = False
+                send("error Line too long.")
+                continue
+            guess = line.decode(errors="replace").strip()
+            if guess.lower() == "quit":
+                break
+            if guess.lower() == "hint":
+                hint = hints.next_hint()
+                send("hint none" if hint is None else f"hint {hint.size} {' '.join(hint.letters)}")
+                continue
+            parsed_guess = parse_guess(guess)
+            if parsed_guess == ("", ""):
+                send("error Invalid guess format. Please use the format 'word1,word2'.")
+                continue
+            label = scorer.add(parsed_guess)
+            hints.record_guess(parsed_guess)
+            send(f"ok {parsed_guess[0]},{parsed_guess[1]} {label} {scorer.score}")
+
+        send(f"stats {encode_stats(scorer.snapshot())}")
+        send("bye")
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+    return [] if scorer is None else scorer.guesses
+
+
+async def serve(explorer: AnagramExplorer, host: str = "127.0.0.1", port: int = 0, unix_path: str = None,
+                **session_options) -> asyncio.AbstractServer:
+    '''Starts a server running one play_session per connection, all sharing explorer.
+
+       Args:
+         explorer (AnagramExplorer): helper object shared by every session
+         host (str): TCP address to listen on (ignored when unix_path is given)
+         port (int): TCP port; 0 picks a free one
+         unix_path (str): Listen on this Unix domain socket instead of TCP
+         session_options: time_limit, fun_factor, distribution and hint_strategy, passed to play_session
+
+       Returns:
+         asyncio.AbstractServer: The listening server; its sockets give the bound address
+
+       Raises:
+         ValueError: If no rack of the explorer's config offers fun_factor anagram words
+                     (for racks too large to tabulate: if none turns up in REJECTION_ATTEMPTS draws)
+    '''
+    fun_factor = session_options.get("fun_factor", DEFAULT_FUN_FACTOR)
+    if explorer.config.rack_size <= MAX_TABLE_RACK_SIZE:
+        #load (or build) the rack table up front so the first sessions don't stall the event loop on it
+        if not get_rack_table(explorer).playable(fun_factor):
+            raise ValueError(f"no {explorer.config.rack_size}-letter rack offers {fun_factor} anagram words")
+    else:
+        #there's no table to consult, so draw one rack the way sessions will; a fun factor no draw reaches
+        #is refused here rather than costing every session REJECTION_ATTEMPTS draws
+        draw_playable_rack(explorer, fun_factor, session_options.get("distribution", DEFAULT_DISTRIBUTION))
+    handler = partial(play_session, explorer=explorer, **session_options)
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handler, unix_path, limit=MAX_LINE_BYTES, backlog=BACKLOG)
+    return await asyncio.start_server(handler, host, port, limit=MAX_LINE_BYTES, backlog=BACKLOG)
+
+
+async def main(args: argparse.Namespace) -> None:
+    config = GameConfig(args.rack_size, args.min_length)
+    explorer = AnagramExplorer(get_word_corpus(), lookup_cache_dir=DEFAULT_LOOKUP_CACHE_DIR, config=config)
+    server = await serve(explorer, args.host, args.port, args.unix, time_limit=args.time_limit,
+                         fun_factor=args.fun_factor, distribution=args.distribution, hint_strategy=args.hints)
+    address = args.unix or "%s:%d" % server.sockets[0].getsockname()[:2]
+    print(f"Anagame server listening on {address}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve concurrent games of Anagame over a line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix domain socket instead of TCP")
+    parser.add_argument("--time-limit", type=float, default=DEFAULT_TIME_LIMIT, help="seconds per game")
+    parser.add_argument("--fun-factor", type=int, default=DEFAULT_FUN_FACTOR)
+    parser.add_argument("--distribution", choices=("uniform", "scrabble"), default=DEFAULT_DISTRIBUTION)
+    parser.add_argument("--hints", choices=STRATEGIES, default="smallest", help="order in which hints reveal families")
+    parser.add_argument("--rack-size", type=int, default=DEFAULT_CONFIG.rack_size, help="letters per rack, 5 to 12")
+    parser.add_argument("--min-length", type=int, default=DEFAULT_CONFIG.min_length, help="shortest scoring word, 2 to 5")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except ValueError as error:  # a config or fun factor no rack can satisfy
+        parser.error(str(error))
+    except KeyboardInterrupt:
+        pass
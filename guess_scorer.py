@@ -0,0 +1,90 @@
+class GuessScorer:
+    '''Scores the guesses of one game as they arrive, keeping the running calc_stats figures.
+
+       The rack's anagrams are computed once, when the scorer is created, so each guess is checked
+       with a few set lookups and the stats are ready at any point instead of being computed at the
+       end of the round.
+
+       Args:
+         letters (list): The list of valid letters from which user should create anagrams
+         explorer (AnagramExplorer): helper object used to compute anagrams of letters.
+         all_possible_anagrams (set): explorer.get_all_anagrams(letters), if the caller already has it
+
+       Example
+       -------
+       >>> scorer = GuessScorer(["p", "o", "t", "s", "r", "i", "a"], explorer)
+       >>> scorer.add(("rat", "art"))
+       'valid'
+       >>> scorer.add(("rat", "art"))
+       'duplicate'
+       >>> scorer.snapshot()["score"]
+       1
+    '''
+
+    def __init__(self, letters: list, explorer, all_possible_anagrams: set = None):
+        if all_possible_anagrams is None:
+            all_possible_anagrams = explorer.get_all_anagrams(letters)
+        self.letters = letters
+        self.all_possible_anagrams = all_possible_anagrams
+        self.guesses = []
+        self.valid = []
+        self.invalid = []
+        self.duplicate = []
+        self.classification = []
+        self.guessed = set() # unique words from valid guesses
+        self.__scored = set() # valid (word1, word2) pairs, to spot duplicates in O(1)
+
+    def add(self, guess: tuple) -> str:
+        '''Scores one guess.
+
+           Args:
+             guess (tuple): A (word1, word2) pair
+
+           Returns:
+             str: "valid", "invalid", or "duplicate" (a repeat of an earlier valid guess)
+        '''
+        word1, word2 = guess
+        if word1 in self.all_possible_anagrams and word2 in self.all_possible_anagrams and word1 != word2:
+            key = (word1, word2)
+            if key in self.__scored:
+                label = "duplicate"
+                self.duplicate.append(guess)
+            else:
+                label = "valid"
+                self.__scored.add(key)
+                self.valid.append(guess)
+                self.guessed.add(word1)
+                self.guessed.add(word2)
+        else:
+            label = "invalid"
+            self.invalid.append(guess)
+        self.guesses.append(guess)
+        self.classification.append(label)
+        return label
+
+    @property
+    def score(self) -> int:
+        return len(self.valid)
+
+    @property
+    def accuracy(self) -> int:
+        return int((len(self.valid) / len(self.guesses)) * 100) if self.guesses else 0
+
+    @property
+    def skill(self) -> int:
+        return int((len(self.guessed) / len(self.all_possible_anagrams)) * 100) if self.all_possible_anagrams else 0
+
+    def snapshot(self) -> dict:
+        '''Returns the stats so far, as calc_stats would for the guesses added: "valid", "invalid" (including
+           duplicates, in guess order), "score", "accuracy", "guessed", "not guessed" and "skill".
+           The lists and sets are copies, so later guesses don't change a snapshot.
+        '''
+        return {
+            "valid": list(self.valid),
+            "invalid": [guess for guess, label in zip(self.guesses, self.classification) if label != "valid"],
+            "score": self.score,
+            "accuracy": self.accuracy,
+            "guessed": set(self.guessed),
+            "not guessed": set(self.all_possible_anagrams) - self.guessed,
+            "skill": self.skill,
+        }
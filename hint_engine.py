@@ -0,0 +1,85 @@
+from collections import namedtuple
+
+from game_config import SCRABBLE_TILES
+from signature import anagram_key
+
+STRATEGIES = ("smallest", "largest", "rarest")
+
+Hint = namedtuple("Hint", ["letters", "size", "words"])
+
+
+def rarity(letters: str) -> float:
+    '''How rare a family's letters are: the sum of 1 / (scrabble tiles of that letter) over its letters,
+       so a "q" (1 tile) weighs as much as twelve "e"s.'''
+    return sum(1 / SCRABBLE_TILES.get(letter, 1) for letter in letters)
+
+
+class HintEngine:
+    '''Serves hints for one rack: the anagram families of the rack that the player hasn't found yet.
+
+       Every family on the rack is grouped and ordered by the strategy once, when the engine is created.
+       next_hint() then walks that order, skipping families already hinted or guessed, so each hint
+       is amortized O(1) and nothing is recomputed while the game runs.
+
+       Strategies:
+         "smallest" - families with the fewest words first (the easiest to finish)
+         "largest"  - families with the most words first (the most points)
+         "rarest"   - families whose letters are rarest in a scrabble bag first (see rarity)
+       Ties go to the alphabetically first family.
+
+       Args:
+         letters (list): The rack
+         explorer (AnagramExplorer): helper object used to compute anagrams of letters.
+         strategy (str): One of STRATEGIES
+         all_possible_anagrams (set): explorer.get_all_anagrams(letters), if the caller already has it
+
+       Example
+       -------
+       >>> hints = HintEngine(["p", "o", "t", "s", "r", "i", "a"], explorer, "largest")
+       >>> hints.next_hint()
+       Hint(letters='aprst', size=6, words=['parts', 'prats', 'sprat', 'strap', 'tarps', 'traps'])
+    '''
+
+    def __init__(self, letters: list, explorer, strategy: str = "smallest", all_possible_anagrams: set = None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+        if all_possible_anagrams is None:
+            all_possible_anagrams = explorer.get_all_anagrams(letters)
+        grouped = {}
+        for word in all_possible_anagrams:
+            grouped.setdefault(anagram_key(word), []).append(word)
+        families = [Hint("".join(sorted(words[0])), len(words), sorted(words)) for words in grouped.values()]
+        if strategy == "smallest":
+            families.sort(key=lambda hint: (hint.size, hint.letters))
+        elif strategy == "largest":
+            families.sort(key=lambda hint: (-hint.size, hint.letters))
+        else:
+            families.sort(key=lambda hint: (-rarity(hint.letters), hint.letters))
+        self.strategy = strategy
+        self.families = families # every family on the rack, in hint order
+        self.given = [] # hints served so far, in order
+        self.__family_of = {word: position for position, hint in enumerate(families) for word in hint.words}
+        self.__found = [False] * len(families) # hinted, or guessed by the player
+        self.__next = 0
+
+    def record_guess(self, guess: tuple) -> None:
+        '''Marks the family of a valid guessed pair as found, so it isn't hinted. Other guesses are ignored.'''
+        word1, word2 = guess
+        family = self.__family_of.get(word1)
+        if family is not None and word1 != word2 and self.__family_of.get(word2) == family:
+            self.__found[family] = True
+
+    def next_hint(self):
+        '''Returns the next family the player hasn't found as a Hint, or None when every family has been found or hinted.'''
+        while self.__next < len(self.families) and self.__found[self.__next]:
+            self.__next += 1
+        if self.__next == len(self.families):
+            return None
+        hint = self.families[self.__next]
+        self.__found[self.__next] = True
+        self.given.append(hint)
+        return hint
+
+    def remaining(self) -> int:
+        '''How many families are neither guessed nor hinted.'''
+        return self.__found.count(False)
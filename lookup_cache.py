@@ -0,0 +1,129 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import zlib
+
+from signature import Signature
+
+CACHE_MAGIC = b"ANAGLOOK"
+CACHE_VERSION = 3
+KEYS_PLAIN = 0
+KEYS_SIGNATURE = 1
+# magic, format version, marshal version, key kind, corpus_digest() of the corpus, payload crc32, payload length
+HEADER = struct.Struct("<8sHHHxx32sII")
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".anagame_cache")
+
+
+class LookupCacheError(ValueError):
+    '''Raised when a cache file is corrupt, stale, or written by another format or Python version.'''
+
+
+def corpus_digest(corpus) -> bytes:
+    '''SHA-256 of the corpus words in their given order, which identifies the corpus a cache file was built from.
+
+       The order matters: a lookup's families come out in corpus order, and that order breaks ties
+       in AnagramExplorer.get_most_anagrams and get_top_families. The digest is computed from the words
+       alone (as UTF-8), so a WordCorpus and a list of the same words share cache files, and any corpus
+       the explorer accepts can be cached.
+    '''
+    words = corpus if isinstance(corpus, (list, tuple)) else list(corpus)
+    digest = hashlib.sha256(f"{len(words)}\n".encode())
+    digest.update("\n".join(words).encode("utf-8"))
+    return digest.digest()
+
+
+def cache_path(name: str, digest: bytes, directory: str = DEFAULT_DIR) -> str:
+    '''The cache file for a lookup called name built from the corpus with this corpus_digest().'''
+    return os.path.join(directory, f"{name}-{digest.hex()[:16]}.lookup")
+
+
+def save_lookup(lookup: dict, path: str, digest: bytes) -> str:
+    '''Serializes a lookup dictionary (written atomically) for load_lookup().
+
+       Args:
+         lookup (dict): Family keys (Signature, int, str or tuple) to lists of words
+         path (str): Destination file
+         digest (bytes): corpus_digest() of the corpus the lookup was built from
+
+       Returns:
+         str: The path that was written
+    '''
+    key_kind = KEYS_SIGNATURE if any(isinstance(key, Signature) for key in lookup) else KEYS_PLAIN
+    #marshal only takes exact built-in types, so Signature keys are stored as plain ints
+    keys = [int(key) if isinstance(key, Signature) else key for key in lookup]
+    payload = marshal.dumps((keys, list(lookup.values())))
+    header = HEADER.pack(CACHE_MAGIC, CACHE_VERSION, marshal.version, key_kind, digest, zlib.crc32(payload), len(payload))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_lookup(path: str, digest: bytes) -> dict:
+    '''Loads a lookup written by save_lookup(), memory-mapping the file rather than reading a copy.
+
+       Args:
+         path (str): The cache file
+         digest (bytes): corpus_digest() of the corpus the caller expects the lookup to describe
+
+       Returns:
+         dict: The lookup, in the same key order it was saved with
+
+       Raises:
+         LookupCacheError: If the file is corrupt, was built from another corpus, or by another format version
+         OSError: If the file can't be read
+    '''
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if len(buffer) < HEADER.size:
+                raise LookupCacheError("lookup cache is shorter than its header")
+            magic, version, marshal_version, key_kind, file_digest, crc, length = HEADER.unpack_from(buffer, 0)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION or marshal_version != marshal.version:
+                raise LookupCacheError("lookup cache was written by another format version")
+            if file_digest != digest:
+                raise LookupCacheError("lookup cache was built from a different corpus")
+            with memoryview(buffer)[HEADER.size:] as payload:
+                if len(payload) != length or zlib.crc32(payload) != crc:
+                    raise LookupCacheError("lookup cache checksum mismatch")
+                keys, values = marshal.loads(payload)
+    if key_kind == KEYS_SIGNATURE:
+        keys = [Signature(key) if type(key) is int else key for key in keys]
+    return dict(zip(keys, values))
+
+
+def cached_lookup(name: str, corpus, build, directory: str = DEFAULT_DIR) -> dict:
+    '''Returns build(), loading it from the on-disk cache when one exists for this corpus,
+       and otherwise building it and saving it for the next process.
+
+       Args:
+         name (str): Identifies the kind of lookup, eg. "explorer" or "sorted_hash"
+         corpus (Sequence): The words the lookup is built from; their corpus_digest() keys the cache file
+         build (function): Builds the lookup when there's no usable cache
+         directory (str): Where cache files live
+
+       Returns:
+         dict: The lookup
+    '''
+    digest = corpus_digest(corpus)
+    path = cache_path(name, digest, directory)
+    try:
+        return load_lookup(path, digest)
+    except (OSError, LookupCacheError):
+        pass
+    lookup = build()
+    try:
+        save_lookup(lookup, path, digest)
+    except OSError:
+        pass
+    return lookup
+
+
+def cached_sorted_hash_dict(corpus, directory: str = DEFAULT_DIR) -> dict:
+    '''anagram_lookup.build_sorted_hash_dict, served from the on-disk cache when the corpus is unchanged.'''
+    from anagram_lookup import build_sorted_hash_dict
+    return cached_lookup("sorted_hash", corpus, lambda: build_sorted_hash_dict(corpus), directory)
@@ -0,0 +1,71 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+def rack_key(letters) -> tuple:
+    '''Canonical cache key for a rack: its letters as a sorted tuple, so any ordering of the same multiset shares one entry.
+
+       Args:
+         letters (iterable): The rack letters
+
+       Returns:
+         tuple: The sorted letters
+    '''
+    return tuple(sorted(letters))
+
+
+class RackCache:
+    '''A bounded least-recently-used cache for per-rack query results.
+
+       Values should be immutable (frozenset, str, tuple), since the same object is handed
+       to every caller that hits the entry. A maxsize of 0 disables caching.
+    '''
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key, default=None):
+        '''Returns the cached value for key (marking it most recently used), or default on a miss.'''
+        with self.__lock:
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        '''Stores value under key, evicting the least recently used entry if the cache is full.'''
+        if self.maxsize == 0:
+            return
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        '''Drops every entry and resets the counters.'''
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        '''Returns hit/miss/eviction counters and the current size.'''
+        with self.__lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.__entries))
+
+    def __len__(self) -> int:
+        return len(self.__entries)
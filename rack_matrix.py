@@ -0,0 +1,138 @@
+from itertools import chain
+
+from signature import Signature
+
+np = None  # numpy, imported by numpy_available() on first use: it takes longer to import than the rest of the game
+_numpy_missing = False
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+RACK_CHUNK_CELLS = 1 << 24  # bound on the bytes of family bitsets gathered at once
+
+
+def numpy_available() -> bool:
+    '''Imports numpy the first time it's needed; returns False if it isn't installed.'''
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:  # the explorer falls back to per-rack pure-Python queries
+            _numpy_missing = True
+    return np is not None
+
+
+class FamilyMatrix:
+    '''The anagram families of a lookup dictionary as an (F x 26) uint8 letter-count matrix.
+
+       Which families fit inside a rack is the comparison `family counts <= rack counts`, precomputed
+       per letter and count as bitsets over the families, and a batch of racks (R x 26) is answered
+       in one call. Rows are kept in lookup dictionary
+       order, so the first maximal row matches AnagramExplorer.get_most_anagrams' tie-break.
+       all_anagrams() only returns words of at least min_length letters, as for the explorer's GameConfig.
+    '''
+
+    def __init__(self, anagram_lookup: dict, min_length: int = 3):
+        if not numpy_available():
+            raise ImportError("FamilyMatrix requires numpy")
+        self.families = list(anagram_lookup.values())
+        self.counts = np.zeros((len(self.families), len(ALPHABET)), dtype=np.uint8)
+        representable = np.ones(len(self.families), dtype=bool)
+        for row, key in enumerate(anagram_lookup):
+            if isinstance(key, Signature):
+                self.counts[row] = np.minimum(key.counts(), 255)
+            else:  # sorted-letter tuple keys hold characters outside a-z, which no rack row can supply
+                representable[row] = False
+        #__too_many[letter, n] is a packed bitset of the families needing more than n of that letter,
+        #so checking a rack is 26 bitset lookups OR-ed together instead of F x 26 comparisons
+        self.__max_count = int(self.counts.max(initial=0))
+        words = -(-len(self.families) // 64)
+        too_many = np.zeros((len(ALPHABET), self.__max_count + 1, words * 8), dtype=np.uint8)
+        for column in range(len(ALPHABET)):
+            for n in range(self.__max_count + 1):
+                packed = np.packbits(self.counts[:, column] > n, bitorder="little")
+                too_many[column, n, :len(packed)] = packed
+        self.__too_many = too_many.view(np.uint64)
+        self.sizes = np.array([len(anagrams) for anagrams in self.families], dtype=np.uint32)
+        self.sizes[~representable] = 0
+        lengths = np.array([len(anagrams[0]) for anagrams in self.families], dtype=np.int64)
+        self.playable = representable & (self.sizes > 1) & (lengths >= min_length)
+
+    def rack_matrix(self, racks) -> "np.ndarray":
+        '''Converts a list of racks (each a list of letters) into an (R x 26) uint8 count matrix.'''
+        rows = []
+        for letters in racks:
+            row = [0] * len(ALPHABET)
+            for letter in letters:
+                index = ord(letter) - 97
+                if 0 <= index < 26:
+                    row[index] += 1
+            rows.append(row)
+        return np.array(rows, dtype=np.uint8).reshape(-1, len(ALPHABET))
+
+    def fits(self, racks: "np.ndarray") -> "np.ndarray":
+        '''Returns an (R x F) boolean matrix: True where the family's letters are all available in the rack.
+
+           Args:
+             racks (np.ndarray): (R x 26) letter counts, eg. from rack_matrix()
+        '''
+        racks = np.minimum(np.asarray(racks, dtype=np.uint8).reshape(-1, len(ALPHABET)), self.__max_count)
+        result = np.empty((len(racks), len(self.families)), dtype=bool)
+        columns = np.arange(len(ALPHABET))
+        step = max(1, RACK_CHUNK_CELLS // (len(ALPHABET) * max(1, self.__too_many.shape[-1]) * 8))
+        for start in range(0, len(racks), step):
+            chunk = racks[start:start + step]
+            #a family fails a rack if any letter column is over the rack's count for that letter
+            failed = np.bitwise_or.reduce(self.__too_many[columns, chunk], axis=1)
+            bits = np.unpackbits(~failed.view(np.uint8), axis=1, count=len(self.families), bitorder="little")
+            result[start:start + step] = bits.view(bool)
+        return result
+
+    def all_anagrams(self, racks) -> list:
+        '''Batch form of AnagramExplorer.get_all_anagrams.
+
+           Args:
+             racks (list): A list of racks, each a list of letters
+
+           Returns:
+             list: one frozenset of anagram words per rack
+        '''
+        fit = self.fits(self.rack_matrix(racks)) & self.playable
+        families = self.families
+        return [frozenset(chain.from_iterable(families[i] for i in np.flatnonzero(row))) for row in fit]
+
+    def most_anagrams(self, racks) -> list:
+        '''Batch form of AnagramExplorer.get_most_anagrams.
+
+           Args:
+             racks (list): A list of racks, each a list of letters
+
+           Returns:
+             list: one word per rack from its largest fitting family ("" if none fits)
+        '''
+        if not self.families:
+            return [""] * len(racks)
+        sizes = self.fits(self.rack_matrix(racks)) * self.sizes
+        best = sizes.argmax(axis=1)
+        return [self.families[i][0] if sizes[row, i] else "" for row, i in enumerate(best)]
+
+    def top_families(self, racks, k: int) -> list:
+        '''Batch form of AnagramExplorer.get_top_families.
+
+           Args:
+             racks (list): A list of racks, each a list of letters
+             k (int): How many families to return per rack
+
+           Returns:
+             list: one list per rack of up to k families (tuples of words), largest first, ties in row order
+        '''
+        columns = np.flatnonzero(self.sizes > 1)
+        if k == 0 or not len(columns):
+            return [[] for _ in racks]
+        #one sortable int per fitting family: size first, then earlier rows (lookup dictionary order) first
+        keys = self.sizes[columns].astype(np.int64) * len(columns) + np.arange(len(columns) - 1, -1, -1)
+        keys = np.where(self.fits(self.rack_matrix(racks))[:, columns], keys, -1)
+        k = min(k, len(columns))
+        best = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        best = np.take_along_axis(best, np.argsort(-np.take_along_axis(keys, best, axis=1), axis=1), axis=1)
+        families = self.families
+        return [[tuple(families[columns[i]]) for i in row if keys[r, i] >= 0] for r, row in enumerate(best)]
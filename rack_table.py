@@ -0,0 +1,345 @@
+import bisect
+import os
+import random
+import struct
+import sys
+import warnings
+import zlib
+import weakref
+from array import array
+from itertools import accumulate, combinations, combinations_with_replacement
+from math import comb, factorial
+
+from game_config import DEFAULT_CONFIG, SCRABBLE_TILES, GameConfig
+from word_corpus import corpus_checksum
+
+MAX_TABLE_RACK_SIZE = 7  # one count per possible rack: comb(33, 8) = 13.9M racks at 8 letters is already too many
+REJECTION_ATTEMPTS = 10000
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+LETTER_BITS = 5
+
+DISTRIBUTIONS = ("uniform", "scrabble")
+TABLE_MAGIC = b"ANAGRACK"
+TABLE_VERSION = 2
+# magic, version, rack size, minimum word length, corpus checksum, rack count, crc32 of the body
+HEADER = struct.Struct("<8sHBBIII")
+
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))  # where table_path() puts tables by default
+
+
+def pack_rack(letters) -> int:
+    '''Packs a rack into an int: its sorted letter indexes, 5 bits each, first letter in the low bits.'''
+    packed = 0
+    for shift, letter in enumerate(sorted(letters)):
+        packed |= (ord(letter) - 97) << (LETTER_BITS * shift)
+    return packed
+
+
+def unpack_rack(packed: int, rack_size: int = DEFAULT_CONFIG.rack_size) -> list:
+    '''Inverse of pack_rack(), returning the letters in sorted order.'''
+    return [ALPHABET[(packed >> (LETTER_BITS * shift)) & 31] for shift in range(rack_size)]
+
+
+def multiset_rank(indexes) -> int:
+    '''Colexicographic rank of a sorted multiset of letter indexes among all multisets of the same size.
+       Adding i to the i-th element turns the multiset into a strictly increasing combination,
+       which the combinatorial number system ranks densely from 0 to comb(26 + size - 1, size) - 1.
+    '''
+    rank = 0
+    for i, index in enumerate(indexes):
+        rank += comb(index + i, i + 1)
+    return rank
+
+
+def draw_rack(distribution: str, rng=random, rack_size: int = DEFAULT_CONFIG.rack_size) -> list:
+    '''Draws a rack without any fun_factor requirement.
+
+       Args:
+         distribution (str): "uniform" - letters chosen uniformly, with replacement
+                             "scrabble" (or anything else) - tiles drawn from a scrabble bag, without replacement
+         rng (random.Random): Source of randomness
+
+       Returns:
+         list: rack_size lowercase letters
+    '''
+    if distribution == "uniform":
+        return [rng.choice(ALPHABET) for _ in range(rack_size)]
+    bag = [letter for letter, count in SCRABBLE_TILES.items() for _ in range(count)]
+    return rng.sample(bag, rack_size)
+
+
+def rack_weight(letters, distribution: str) -> int:
+    '''Relative probability that draw_rack() produces this multiset of letters.
+
+       Args:
+         letters (list): The rack letters
+         distribution (str): As in draw_rack()
+
+       Returns:
+         int: The number of ordered uniform draws, or of scrabble tile subsets, that produce the rack
+    '''
+    counts = {}
+    for letter in letters:
+        counts[letter] = counts.get(letter, 0) + 1
+    weight = 1
+    if distribution == "uniform":
+        weight = factorial(len(letters))
+        for count in counts.values():
+            weight //= factorial(count)
+    else:
+        for letter, count in counts.items():
+            weight *= comb(SCRABBLE_TILES[letter], count)
+    return weight
+
+
+class RackTable:
+    '''Every distinct rack that can form at least one anagram word, with its anagram word count.
+
+       Racks are stored as packed ints (see pack_rack) ordered by descending count, so the racks that
+       meet any fun_factor are always a prefix of the table. sample() draws from that prefix, weighted
+       by the requested letter distribution (see rack_weight), which is the same distribution rejection
+       sampling converges to.
+    '''
+
+    def __init__(self, racks: array, counts: array, weights: dict, checksum: int, rack_size: int = DEFAULT_CONFIG.rack_size,
+                 min_length: int = DEFAULT_CONFIG.min_length):
+        self.racks = racks
+        self.counts = counts
+        self.weights = weights
+        self.checksum = checksum
+        self.rack_size = rack_size
+        self.min_length = min_length
+        self.__cumulative = {}
+
+    def __len__(self) -> int:
+        return len(self.racks)
+
+    def playable(self, fun_factor: int) -> int:
+        '''Returns how many racks offer at least fun_factor anagram words.'''
+        return bisect.bisect_right(self.counts, -fun_factor, key=lambda count: -count)
+
+    def __cumulative_weights(self, distribution: str) -> array:
+        if distribution not in self.__cumulative:
+            self.__cumulative[distribution] = array("d", accumulate(self.weights[distribution]))
+        return self.__cumulative[distribution]
+
+    def sample(self, fun_factor: int, distribution: str, rng=random) -> list:
+        '''Draws a rack offering at least fun_factor anagram words.
+
+           Args:
+             fun_factor (int): minimum number of unique anagram words offered by the rack
+             distribution (str): "uniform" or "scrabble", as in draw_rack()
+             rng (random.Random): Source of randomness
+
+           Returns:
+             list: rack_size lowercase letters, in random order
+
+           Raises:
+             ValueError: If no rack reachable with the distribution meets fun_factor
+        '''
+        distribution = "uniform" if distribution == "uniform" else "scrabble"
+        if fun_factor <= 0:
+            return draw_rack(distribution, rng, self.rack_size)
+        end = self.playable(fun_factor)
+        cumulative = self.__cumulative_weights(distribution)
+        if end == 0 or cumulative[end - 1] == 0:
+            raise ValueError(f"no {distribution} rack offers {fun_factor} anagram words")
+        index = bisect.bisect_right(cumulative, rng.random() * cumulative[end - 1], 0, end - 1)
+        letters = unpack_rack(self.racks[index], self.rack_size)
+        rng.shuffle(letters)
+        return letters
+
+    def to_bytes(self) -> bytes:
+        columns = [array("Q", self.racks), array("I", self.counts)]
+        columns.extend(array("I", self.weights[distribution]) for distribution in DISTRIBUTIONS)
+        if sys.byteorder != "little":
+            for column in columns:
+                column.byteswap()
+        body = b"".join(column.tobytes() for column in columns)
+        header = HEADER.pack(TABLE_MAGIC, TABLE_VERSION, self.rack_size, self.min_length, self.checksum, len(self.racks), zlib.crc32(body))
+        return header + body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RackTable":
+        '''Parses a table written by to_bytes().
+
+           Raises:
+             ValueError: If the data is corrupt or from an unknown format version
+        '''
+        if len(data) < HEADER.size:
+            raise ValueError("rack table is shorter than its header")
+        magic, version, rack_size, min_length, checksum, count, crc = HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"not a version {TABLE_VERSION} rack table")
+        body = memoryview(data)[HEADER.size:]
+        if len(body) != (8 + 4 + 4 * len(DISTRIBUTIONS)) * count or zlib.crc32(body) != crc:
+            raise ValueError("rack table checksum mismatch")
+        columns = []
+        start = 0
+        for typecode in "QI" + "I" * len(DISTRIBUTIONS):
+            column = array(typecode)
+            end = start + column.itemsize * count
+            column.frombytes(body[start:end])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append(column)
+            start = end
+        racks, counts, *weights = columns
+        return cls(racks, counts, dict(zip(DISTRIBUTIONS, weights)), checksum, rack_size, min_length)
+
+
+def build_rack_table(explorer, rack_size: int = None, min_length: int = None) -> RackTable:
+    '''Counts the anagram words offered by every possible rack.
+
+       Rather than querying each of the comb(32, 7) racks, each anagram family is added to every rack
+       that contains it: the family's letters plus every completion up to rack_size letters.
+
+       Args:
+         explorer (AnagramExplorer): Supplies the corpus and its anagram families
+         rack_size (int): Letters per rack, explorer.config.rack_size by default
+         min_length (int): Shortest word counted, explorer.config.min_length by default
+
+       Returns:
+         RackTable: The racks with a non-zero count
+    '''
+    rack_size = explorer.config.rack_size if rack_size is None else rack_size
+    min_length = explorer.config.min_length if min_length is None else min_length
+    counts = array("I", bytes(4 * comb(len(ALPHABET) + rack_size - 1, rack_size)))
+    completions = {}
+    for key, anagrams in explorer.anagram_lookup.items():
+        if len(anagrams) < 2 or not min_length <= len(key) <= rack_size or not all(letter in ALPHABET for letter in key):
+            continue
+        family = [ord(letter) - 97 for letter in key]
+        size = len(set(anagrams))
+        extra = rack_size - len(key)
+        if extra not in completions:
+            completions[extra] = list(combinations_with_replacement(range(len(ALPHABET)), extra))
+        for completion in completions[extra]:
+            counts[multiset_rank(sorted(family + list(completion)))] += size
+
+    #combinations() walks the strictly increasing forms in lexicographic order, which is colex order reversed
+    rows = []
+    last = len(counts) - 1
+    for position, combination in enumerate(combinations(range(len(ALPHABET) + rack_size - 1), rack_size)):
+        count = counts[last - position]
+        if count:
+            mirrored = sorted(len(ALPHABET) + rack_size - 2 - index for index in combination)
+            packed = 0
+            for shift, index in enumerate(mirrored):
+                packed |= (index - shift) << (LETTER_BITS * shift)
+            rows.append((-count, packed))
+    rows.sort()
+    racks = array("Q", [row[1] for row in rows])
+    weights = {}
+    for distribution in DISTRIBUTIONS:
+        weights[distribution] = array("I", [rack_weight(unpack_rack(rack, rack_size), distribution) for rack in racks])
+    return RackTable(racks, array("I", [-row[0] for row in rows]), weights, corpus_checksum(explorer.corpus), rack_size, min_length)
+
+
+def table_path(config: GameConfig, checksum: int, directory: str = TABLE_DIR) -> str:
+    '''Where the table for a game config and the corpus with this checksum lives. Every corpus gets its own
+       file, so an explorer over another word list never overwrites the table of the real one.'''
+    return os.path.join(directory, f"rack_table-{config.rack_size}-{config.min_length}-{checksum:08x}.bin")
+
+
+def save_rack_table(table: RackTable, path: str) -> str:
+    '''Writes a table atomically, returning the path written.'''
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(table.to_bytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_rack_table(path: str) -> RackTable:
+    '''Reads a table written by save_rack_table().'''
+    with open(path, "rb") as f:
+        return RackTable.from_bytes(f.read())
+
+
+_tables = weakref.WeakKeyDictionary()
+
+
+def get_rack_table(explorer, path: str = None) -> RackTable:
+    '''Returns the rack table for an explorer's corpus and game config, loading it from path when it matches
+       and otherwise building it (and saving it to path for the next process).
+
+       Tables are meant to be built offline, with `python rack_table.py [--rack-size N] [--min-length N]`.
+       Building one here takes tens of seconds for 7-letter racks, so a RuntimeWarning is issued first.
+
+       Args:
+         explorer (AnagramExplorer): The explorer whose corpus and config the table must describe
+         path (str): Table file location, table_path(explorer.config, corpus checksum) by default
+
+       Returns:
+         RackTable: The table, shared by every caller using the same explorer
+
+       Raises:
+         ValueError: If the config's racks are too large to tabulate (see MAX_TABLE_RACK_SIZE)
+    '''
+    table = _tables.get(explorer)
+    if table is not None:
+        return table
+    rack_size, min_length = explorer.config
+    if rack_size > MAX_TABLE_RACK_SIZE:
+        raise ValueError(f"rack tables hold racks of at most {MAX_TABLE_RACK_SIZE} letters, not {rack_size}")
+    checksum = corpus_checksum(explorer.corpus)
+    path = table_path(explorer.config, checksum) if path is None else path
+    try:
+        table = load_rack_table(path)
+    except (OSError, ValueError):
+        table = None
+    if table is None or table.checksum != checksum or table.rack_size != rack_size or table.min_length != min_length:
+        warnings.warn(f"no rack table for this corpus and config at {path}; building it now, which can take tens of "
+                      f"seconds (build it offline with: python rack_table.py --rack-size {rack_size} --min-length {min_length})",
+                      RuntimeWarning, stacklevel=2)
+        table = build_rack_table(explorer)
+        try:
+            save_rack_table(table, path)
+        except OSError:
+            pass
+    _tables[explorer] = table
+    return table
+
+
+def draw_playable_rack(explorer, fun_factor: int, distribution: str, rng=random, attempts: int = REJECTION_ATTEMPTS) -> list:
+    '''Draws racks of explorer.config.rack_size letters until one offers at least fun_factor anagram words.
+       This is how racks too large for a RackTable are drawn; large racks offer many words, so few draws are needed.
+
+       Args:
+         explorer (AnagramExplorer): Answers get_all_anagrams for each draw
+         fun_factor (int): minimum number of unique anagram words offered by the rack
+         distribution (str): "uniform" or "scrabble", as in draw_rack()
+         rng (random.Random): Source of randomness
+         attempts (int): Draws to try before giving up
+
+       Returns:
+         list: The rack letters
+
+       Raises:
+         ValueError: If none of the draws meets fun_factor
+    '''
+    for _ in range(attempts):
+        letters = draw_rack(distribution, rng, explorer.config.rack_size)
+        if len(explorer.get_all_anagrams(letters)) >= fun_factor:
+            return letters
+    raise ValueError(f"no {distribution} rack offering {fun_factor} anagram words found in {attempts} draws")
+
+
+if __name__ == "__main__":
+    import argparse
+    from AnagramExplorer import AnagramExplorer
+    from word_corpus import get_word_corpus
+
+    parser = argparse.ArgumentParser(description="Build the playable-rack table for a game config.")
+    parser.add_argument("path", nargs="?", help="output file, by default the config's table_path()")
+    parser.add_argument("--rack-size", type=int, default=DEFAULT_CONFIG.rack_size)
+    parser.add_argument("--min-length", type=int, default=DEFAULT_CONFIG.min_length)
+    args = parser.parse_args()
+
+    config = GameConfig(args.rack_size, args.min_length)
+    corpus = get_word_corpus()
+    out_path = args.path or table_path(config, corpus_checksum(corpus))
+    table = build_rack_table(AnagramExplorer(corpus, config=config))
+    save_rack_table(table, out_path)
+    print(f"Wrote {len(table)} playable racks (max {table.counts[0]} anagram words) to {out_path}")
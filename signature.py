@@ -0,0 +1,119 @@
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+FIELD_BITS = 8  # 7 bits of count plus a guard bit used by fits_in
+MAX_COUNT = (1 << (FIELD_BITS - 1)) - 1
+_FIELD_MASK = (1 << FIELD_BITS) - 1
+_UNITS = {letter: 1 << (FIELD_BITS * i) for i, letter in enumerate(ALPHABET)}
+_GUARDS = sum((1 << (FIELD_BITS - 1)) << (FIELD_BITS * i) for i in range(len(ALPHABET)))
+
+
+class Signature(int):
+    '''The letter counts of a word or rack, packed into one int: 8 bits per letter, "a" in the lowest byte.
+
+       Two words are anagrams exactly when their signatures are equal, so a Signature is the anagram
+       family key used across the game. Being an int it hashes and compares in O(1), and rack
+       containment (fits_in) and removing letters (-) are a handful of integer operations.
+       Each letter can appear at most MAX_COUNT (127) times.
+
+       Examples:
+        >>> Signature.of("stop") == Signature.of("pots")
+        True
+        >>> Signature.of("pots").fits_in(Signature.of("potsria"))
+        True
+        >>> (Signature.of("potsria") - Signature.of("pots")).letters()
+        'air'
+    '''
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, letters) -> "Signature":
+        '''Builds the signature of a word or a list of letters.
+
+           Raises:
+             ValueError: If letters contains anything other than a-z, or a letter more than MAX_COUNT times
+        '''
+        if not isinstance(letters, (str, list, tuple)):
+            letters = list(letters)
+        try:
+            packed = sum(map(_UNITS.__getitem__, letters))
+        except KeyError as error:
+            raise ValueError(f"signatures only hold the letters a-z, got {error.args[0]!r}") from None
+        # a field can only overflow (into its guard bit, or past it) once there are more letters than MAX_COUNT
+        if len(letters) > MAX_COUNT and any(letters.count(letter) > MAX_COUNT for letter in set(letters)):
+            raise ValueError(f"signatures hold at most {MAX_COUNT} of each letter")
+        return cls(packed)
+
+    @classmethod
+    def from_counts(cls, counts) -> "Signature":
+        '''Builds a signature from 26 letter counts, a first.'''
+        packed = 0
+        for i, count in enumerate(counts):
+            if not 0 <= count <= MAX_COUNT:
+                raise ValueError(f"letter counts must be between 0 and {MAX_COUNT}")
+            packed |= count << (FIELD_BITS * i)
+        return cls(packed)
+
+    def counts(self) -> list:
+        '''Returns the 26 letter counts, a first.'''
+        return [(self >> (FIELD_BITS * i)) & _FIELD_MASK for i in range(len(ALPHABET))]
+
+    def letters(self) -> str:
+        '''Returns the letters in alphabetical order, eg. "opst" for "stop".'''
+        return "".join(letter * count for letter, count in zip(ALPHABET, self.counts()) if count)
+
+    def __len__(self) -> int:
+        return sum(self.counts())
+
+    def __iter__(self):
+        return iter(self.letters())
+
+    def fits_in(self, rack) -> bool:
+        '''Returns True if every letter of this signature is available in rack (a Signature, word or list of letters).'''
+        if not isinstance(rack, int):
+            rack = Signature.of(rack)
+        # each field of rack|guards is 128 + count; subtracting a count <= 127 clears the guard bit only if it underflows
+        return ((rack | _GUARDS) - self) & _GUARDS == _GUARDS
+
+    def __add__(self, other) -> "Signature":
+        if not isinstance(other, Signature):
+            return NotImplemented
+        total = int(self) + int(other)
+        if total & _GUARDS:
+            raise ValueError(f"signatures hold at most {MAX_COUNT} of each letter")
+        return Signature(total)
+
+    def __sub__(self, other) -> "Signature":
+        '''Removes other's letters, eg. the letters left on a rack after playing a word.
+
+           Raises:
+             ValueError: If other does not fit in this signature
+        '''
+        if not isinstance(other, Signature):
+            return NotImplemented
+        if not other.fits_in(self):
+            raise ValueError(f"{other.letters()!r} does not fit in {self.letters()!r}")
+        return Signature(int(self) - int(other))
+
+    def __repr__(self) -> str:
+        return f"Signature({self.letters()!r})"
+
+
+def letter_unit(letter: str) -> Signature:
+    '''The signature of a single letter, for building signatures incrementally.'''
+    return Signature(_UNITS[letter])
+
+
+def anagram_key(word: str):
+    '''The anagram family key for a word: its Signature, or for words a Signature can't hold
+       (characters outside a-z, or a letter repeated more than MAX_COUNT times) the tuple of its sorted letters.
+
+       Args:
+         word (str): The word
+
+       Returns:
+         Signature | tuple: Equal for two words exactly when they are anagrams
+    '''
+    try:
+        return Signature.of(word)
+    except ValueError:
+        return tuple(sorted(word))
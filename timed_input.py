@@ -0,0 +1,76 @@
+import os
+import selectors
+import time
+
+
+class DeadlineReader:
+    '''Reads lines from a file or terminal, giving up at a deadline on the time.monotonic() clock.
+
+       The stream's file descriptor is watched with a selector, so a blocked read wakes up exactly when
+       the deadline passes instead of waiting for the next line. The descriptor is read directly, so lines
+       already buffered by the stream object itself (eg. by an earlier input() call) are not seen.
+       Streams without a file descriptor (eg. io.StringIO), and streams the selector can't watch (on Windows
+       select() only takes sockets), are read with plain readline() calls and can only be stopped between lines.
+
+       Example
+       -------
+       >>> reader = DeadlineReader(sys.stdin)
+       >>> reader.readline(time.monotonic() + 5)   # None if nothing was entered within 5 seconds
+       'eat,tea'
+    '''
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.__buffer = b""
+        self.__eof = False
+        self.__selector = None
+        self.__fd = None
+        if os.name == "nt":  # select() there only takes sockets, not consoles, files or pipes
+            return
+        try:
+            self.__fd = stream.fileno()
+            selector = selectors.DefaultSelector()
+            selector.register(self.__fd, selectors.EVENT_READ)
+            self.__selector = selector
+        except (AttributeError, OSError, ValueError):
+            self.__fd = None
+
+    def readline(self, deadline: float):
+        '''Returns the next line without its line ending, or None once the deadline passes or the stream ends.
+
+           Args:
+             deadline (float): A time.monotonic() value
+        '''
+        if self.__selector is None:
+            return self.__readline_plain(deadline)
+        while b"\n" not in self.__buffer and not self.__eof:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                ready = self.__selector.select(remaining)
+            except OSError:  # a descriptor this platform's selector accepted but can't poll
+                self.close()
+                return self.__readline_plain(deadline)
+            if not ready:
+                return None
+            chunk = os.read(self.__fd, 4096)
+            self.__buffer += chunk
+            self.__eof = not chunk
+        if not self.__buffer:
+            return None
+        line, _, self.__buffer = self.__buffer.partition(b"\n")
+        return line.decode(errors="replace").rstrip("\r")
+
+    def __readline_plain(self, deadline: float):
+        if time.monotonic() >= deadline:
+            return None
+        #bytes already read from the descriptor come first, if the selector stopped working mid-line
+        pending, self.__buffer = self.__buffer.decode(errors="replace"), b""
+        line = pending + ("" if self.__eof else self.stream.readline())
+        return line.rstrip("\r\n") if line and time.monotonic() < deadline else None
+
+    def close(self) -> None:
+        if self.__selector is not None:
+            self.__selector.close()
+            self.__selector = None
@@ -0,0 +1,220 @@
+import bisect
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+
+CORPUS_MAGIC = b"ANAGWRDS"
+CORPUS_VERSION = 1
+# magic, version, reserved, word count, packed data length, crc32 of offsets + data
+HEADER = struct.Struct("<8sHHIII")
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "valid_anagame_words.py")
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "valid_anagame_words.corpus")
+
+
+class CorpusFormatError(ValueError):
+    '''Raised when a corpus file is truncated, corrupt, or written by an unknown version.'''
+
+
+def pack_corpus(words) -> bytes:
+    '''Packs a word list into the binary corpus format.
+
+       Layout (all integers little-endian):
+         header  - magic, version, word count, data length, crc32 (see HEADER)
+         offsets - word count + 1 uint32 offsets into the data block
+         data    - the sorted words, ascii-encoded and concatenated
+
+       Args:
+         words (iterable): The words to pack
+
+       Returns:
+         bytes: The packed corpus
+    '''
+    words = sorted(words)
+    data = "".join(words).encode("ascii")
+    offsets = array("I", [0])
+    position = 0
+    for word in words:
+        position += len(word)
+        offsets.append(position)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    body = offsets.tobytes() + data
+    header = HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, 0, len(words), len(data), zlib.crc32(body))
+    return header + body
+
+
+def write_corpus(words, path: str = DEFAULT_PATH) -> str:
+    '''Writes a word list to disk in the binary corpus format.
+       The file is written to a temporary name first so readers never see a partial corpus.
+
+       Args:
+         words (iterable): The words to write
+         path (str): Destination file
+
+       Returns:
+         str: The path that was written
+    '''
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pack_corpus(words))
+    os.replace(tmp_path, path)
+    return path
+
+
+class WordCorpus(Sequence):
+    '''A read-only, sorted word list backed by a packed buffer (usually a memory-mapped file).
+
+       Behaves like the list returned by get_valid_word_list(): supports len(), indexing,
+       slicing, iteration and `in`. Membership is a binary search over the sorted words, and
+       no per-word Python objects are kept alive between calls.
+    '''
+
+    def __init__(self, buffer, checksum_verified: bool = False):
+        if len(buffer) < HEADER.size:
+            raise CorpusFormatError("corpus is shorter than its header")
+        magic, version, _, count, data_length, checksum = HEADER.unpack_from(buffer, 0)
+        if magic != CORPUS_MAGIC:
+            raise CorpusFormatError("not an anagame corpus file")
+        if version != CORPUS_VERSION:
+            raise CorpusFormatError(f"unsupported corpus version {version}")
+        offsets_end = HEADER.size + 4 * (count + 1)
+        if len(buffer) != offsets_end + data_length:
+            raise CorpusFormatError("corpus length does not match its header")
+
+        view = memoryview(buffer)
+        if not checksum_verified and zlib.crc32(view[HEADER.size:]) != checksum:
+            raise CorpusFormatError("corpus checksum mismatch")
+
+        self._buffer = buffer
+        self._count = count
+        self._data = view[offsets_end:]
+        if sys.byteorder == "little":
+            self._offsets = view[HEADER.size:offsets_end].cast("I")
+        else:
+            self._offsets = array("I", view[HEADER.size:offsets_end])
+            self._offsets.byteswap()
+        self.checksum = checksum
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("corpus index out of range")
+        return str(self._data[self._offsets[index]:self._offsets[index + 1]], "ascii")
+
+    def __iter__(self):
+        data = str(self._data, "ascii")
+        offsets = self._offsets
+        for i in range(self._count):
+            yield data[offsets[i]:offsets[i + 1]]
+
+    def __contains__(self, word) -> bool:
+        if not isinstance(word, str):
+            return False
+        i = bisect.bisect_left(self, word)
+        return i < self._count and self[i] == word
+
+    def index(self, word, start: int = 0, stop: int = None) -> int:
+        stop = self._count if stop is None else stop
+        i = bisect.bisect_left(self, word, start, stop)
+        if i < stop and self[i] == word:
+            return i
+        raise ValueError(f"{word!r} is not in corpus")
+
+    def count(self, word) -> int:
+        return int(word in self)
+
+    def __repr__(self) -> str:
+        return f"WordCorpus({self._count} words, crc32={self.checksum:#010x})"
+
+
+def corpus_checksum(words) -> int:
+    '''Returns the crc32 a corpus file for these words would carry, so derived indexes can detect a changed corpus.
+
+       Args:
+         words (iterable): A word list or WordCorpus
+
+       Returns:
+         int: The corpus checksum
+    '''
+    if isinstance(words, WordCorpus):
+        return words.checksum
+    return HEADER.unpack_from(pack_corpus(words), 0)[-1]
+
+
+def load_corpus(path: str = DEFAULT_PATH) -> WordCorpus:
+    '''Memory-maps a corpus file written by write_corpus().
+
+       Args:
+         path (str): The corpus file
+
+       Returns:
+         WordCorpus: A read-only view of the words in the file
+
+       Raises:
+         CorpusFormatError: If the file is corrupt or from an unknown format version
+    '''
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return WordCorpus(buffer)
+
+
+def convert_word_module(path: str = DEFAULT_PATH) -> str:
+    '''Regenerates the binary corpus from valid_anagame_words, which remains the source of truth.
+
+       Args:
+         path (str): Destination file
+
+       Returns:
+         str: The path that was written
+    '''
+    from valid_anagame_words import get_valid_word_list
+    return write_corpus(get_valid_word_list(), path)
+
+
+def _is_stale(path: str) -> bool:
+    try:
+        return os.path.getmtime(path) < os.path.getmtime(SOURCE_PATH)
+    except OSError:
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_word_corpus() -> Sequence:
+    '''Returns the shared game corpus, loading it once per process.
+
+       The packed corpus file is memory-mapped when it exists and is newer than
+       valid_anagame_words.py; otherwise it is regenerated from the word module first.
+       If the file can't be written (eg. a read-only install) the plain word list is returned.
+
+       Returns:
+         Sequence: The sorted list of valid words
+    '''
+    if _is_stale(DEFAULT_PATH):
+        try:
+            convert_word_module(DEFAULT_PATH)
+        except OSError:
+            from valid_anagame_words import get_valid_word_list
+            return get_valid_word_list()
+    try:
+        return load_corpus(DEFAULT_PATH)
+    except CorpusFormatError:
+        convert_word_module(DEFAULT_PATH)
+        return load_corpus(DEFAULT_PATH)
+
+
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    corpus = load_corpus(convert_word_module(out_path))
+    print(f"Wrote {corpus!r} to {out_path} ({os.path.getsize(out_path)} bytes)")